@@ -0,0 +1,22 @@
+"""add keyword crawl depth
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("keywords", sa.Column("crawl_depth", sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("keywords", "crawl_depth")
@@ -0,0 +1,25 @@
+"""add http_checks.from_cache
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "http_checks",
+        sa.Column("from_cache", sa.Boolean(), nullable=False, server_default=sa.sql.expression.false()),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("http_checks", "from_cache")
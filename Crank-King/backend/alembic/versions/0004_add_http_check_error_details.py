@@ -0,0 +1,24 @@
+"""add http_checks error category and certificate expiry
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("http_checks", sa.Column("error_category", sa.String(), nullable=True))
+    op.add_column("http_checks", sa.Column("cert_expires_at", sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("http_checks", "cert_expires_at")
+    op.drop_column("http_checks", "error_category")
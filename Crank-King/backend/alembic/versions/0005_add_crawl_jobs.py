@@ -0,0 +1,43 @@
+"""add crawl_jobs queue
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "crawl_jobs",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("keyword_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("keywords.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("crawl_run_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("crawl_runs.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("status", sa.String(), nullable=False, server_default="queued"),
+        sa.Column("source", sa.String(), nullable=False, server_default="api"),
+        sa.Column("use_cache", sa.Boolean(), nullable=False, server_default=sa.sql.expression.true()),
+        sa.Column("run_after", sa.DateTime(), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("worker_id", sa.String(), nullable=True),
+        sa.Column("lease_expires_at", sa.DateTime(), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("started_at", sa.DateTime(), nullable=True),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_crawl_jobs_keyword_id", "crawl_jobs", ["keyword_id"])
+    op.create_index("ix_crawl_jobs_status_run_after", "crawl_jobs", ["status", "run_after"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_crawl_jobs_status_run_after", table_name="crawl_jobs")
+    op.drop_index("ix_crawl_jobs_keyword_id", table_name="crawl_jobs")
+    op.drop_table("crawl_jobs")
@@ -0,0 +1,26 @@
+"""add keywords.volatility and keywords.next_crawl_at
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("keywords", sa.Column("volatility", sa.Float(), nullable=True))
+    op.add_column("keywords", sa.Column("next_crawl_at", sa.DateTime(), nullable=True))
+    op.create_index("ix_keywords_next_crawl_at", "keywords", ["next_crawl_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_keywords_next_crawl_at", table_name="keywords")
+    op.drop_column("keywords", "next_crawl_at")
+    op.drop_column("keywords", "volatility")
@@ -0,0 +1,48 @@
+"""allow one queued/running crawl job per keyword
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Keep the oldest active job of each keyword; the duplicates and their runs are closed as superseded.
+    op.execute(
+        """
+        WITH ranked AS (
+            SELECT id, crawl_run_id,
+                   row_number() OVER (PARTITION BY keyword_id ORDER BY created_at, id) AS position
+            FROM crawl_jobs
+            WHERE status IN ('queued', 'running')
+        ), superseded AS (
+            UPDATE crawl_jobs
+            SET status = 'failed', error = 'superseded', finished_at = now(), lease_expires_at = NULL
+            FROM ranked
+            WHERE crawl_jobs.id = ranked.id AND ranked.position > 1
+            RETURNING crawl_jobs.crawl_run_id
+        )
+        UPDATE crawl_runs
+        SET status = 'failure', completed_at = now(), notes = 'superseded'
+        WHERE id IN (SELECT crawl_run_id FROM superseded) AND status IN ('pending', 'running')
+        """
+    )
+    op.create_index(
+        "uq_crawl_jobs_active_keyword",
+        "crawl_jobs",
+        ["keyword_id"],
+        unique=True,
+        postgresql_where=sa.text("status IN ('queued', 'running')"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_crawl_jobs_active_keyword", table_name="crawl_jobs")
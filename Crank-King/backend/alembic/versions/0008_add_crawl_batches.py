@@ -0,0 +1,42 @@
+"""add crawl_batches and crawl_batch_items
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "crawl_batches",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("owner_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("filters", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column("use_cache", sa.Boolean(), nullable=False, server_default=sa.sql.expression.true()),
+        sa.Column("total", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_crawl_batches_owner_id", "crawl_batches", ["owner_id"])
+    op.create_table(
+        "crawl_batch_items",
+        sa.Column("batch_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("crawl_batches.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("keyword_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("keywords.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("crawl_run_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("crawl_runs.id", ondelete="CASCADE"), nullable=False),
+    )
+    op.create_index("ix_crawl_batch_items_crawl_run_id", "crawl_batch_items", ["crawl_run_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_crawl_batch_items_crawl_run_id", table_name="crawl_batch_items")
+    op.drop_table("crawl_batch_items")
+    op.drop_index("ix_crawl_batches_owner_id", table_name="crawl_batches")
+    op.drop_table("crawl_batches")
@@ -0,0 +1,49 @@
+"""add keywords latest run summary and crawl_runs(keyword_id, status, started_at) index
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("keywords", sa.Column("latest_run_id", postgresql.UUID(as_uuid=True), nullable=True))
+    op.add_column("keywords", sa.Column("latest_flag", sa.String(), nullable=True))
+    op.add_column("keywords", sa.Column("latest_run_at", sa.DateTime(), nullable=True))
+    op.add_column("keywords", sa.Column("latest_run_started_at", sa.DateTime(), nullable=True))
+    op.create_index(
+        "ix_crawl_runs_keyword_status_started", "crawl_runs", ["keyword_id", "status", "started_at"]
+    )
+    op.execute(
+        """
+        UPDATE keywords
+        SET latest_run_id = latest.id,
+            latest_flag = latest.flag,
+            latest_run_at = latest.completed_at,
+            latest_run_started_at = latest.started_at
+        FROM (
+            SELECT DISTINCT ON (keyword_id) keyword_id, id, flag, completed_at, started_at
+            FROM crawl_runs
+            WHERE status = 'success'
+            ORDER BY keyword_id, started_at DESC
+        ) AS latest
+        WHERE keywords.id = latest.keyword_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_crawl_runs_keyword_status_started", table_name="crawl_runs")
+    op.drop_column("keywords", "latest_run_started_at")
+    op.drop_column("keywords", "latest_run_at")
+    op.drop_column("keywords", "latest_flag")
+    op.drop_column("keywords", "latest_run_id")
@@ -1,16 +1,37 @@
+import asyncio
+import json
+import time
+from typing import List
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from app.api import deps
+from app.core.config import settings
+from app.crud import batch as crud_batch
 from app.crud import crawl as crud_crawl
 from app.crud import keyword as crud_keyword
-from app.schemas.crawl import CrawlRun
-from app.services.crawler import execute_crawl
+from app.db.session import run_in_db, run_in_session
+from app.models.crawl import CrawlRun as CrawlRunModel
+from app.models.keyword import Keyword
+from app.schemas.crawl import CrawlBatch, CrawlBatchCreate, CrawlBatchResult, CrawlRun
+from app.services.crawl_queue import (
+    TERMINAL_RUN_STATUSES,
+    enqueue_crawl,
+    load_run,
+    pending_run,
+    run_status,
+    wait_for_run,
+)
 
 router = APIRouter()
 
+MAX_WAIT_SECONDS = 60.0
+EVENT_POLL_SECONDS = 1.0
+EVENT_KEEPALIVE_SECONDS = 15.0
+
 
 def _get_owned_keyword(db: Session, keyword_id: UUID, user_id: UUID):
     keyword = crud_keyword.get(db, keyword_id)
@@ -19,11 +40,35 @@ def _get_owned_keyword(db: Session, keyword_id: UUID, user_id: UUID):
     return keyword
 
 
+def _ensure_owned_run(db: Session, run_id: UUID, user_id: UUID) -> None:
+    owner_id = (
+        db.query(Keyword.owner_id)
+        .join(CrawlRunModel, CrawlRunModel.keyword_id == Keyword.id)
+        .filter(CrawlRunModel.id == run_id)
+        .scalar()
+    )
+    if owner_id != user_id:
+        raise HTTPException(status_code=404, detail="Run not found")
+
+
 @router.post("/keywords/{keyword_id}/crawl", response_model=CrawlRun, status_code=202)
-async def trigger_crawl(keyword_id: UUID, *, db: Session = Depends(deps.get_db), current_user=Depends(deps.get_current_user)):
-    keyword = _get_owned_keyword(db, keyword_id, current_user.id)
-    run = await execute_crawl(db, keyword)
-    return run
+async def trigger_crawl(
+    keyword_id: UUID,
+    *,
+    refresh: bool = False,
+    db: Session = Depends(deps.get_db),
+    current_user=Depends(deps.get_current_user),
+):
+    keyword = await run_in_db(_get_owned_keyword, db, keyword_id, current_user.id)
+    crawl = await enqueue_crawl(keyword.id, use_cache=not refresh)
+    if crawl is None:
+        if await run_in_db(crud_keyword.get, db, keyword_id) is None:
+            raise HTTPException(status_code=404, detail="Keyword not found")
+        raise HTTPException(status_code=409, detail="Crawl could not be queued, retry")
+    if crawl.created:
+        return pending_run(crawl)
+    # Coalesced onto a crawl already in flight (or just finished): hand back that run as it stands.
+    return await run_in_db(load_run, db, crawl.crawl_run_id)
 
 
 @router.get("/crawl-runs/{run_id}", response_model=CrawlRun)
@@ -32,3 +77,146 @@ def get_crawl_run(run_id: UUID, *, db: Session = Depends(deps.get_db), current_u
     if not run or run.keyword.owner_id != current_user.id:
         raise HTTPException(status_code=404, detail="Run not found")
     return run
+
+
+@router.get("/crawl-runs/{run_id}/wait", response_model=CrawlRun)
+async def wait_crawl_run(
+    run_id: UUID,
+    *,
+    timeout: float = Query(30.0, ge=0, le=MAX_WAIT_SECONDS),
+    db: Session = Depends(deps.get_db),
+    current_user=Depends(deps.get_current_user),
+):
+    # Long poll: answers as soon as the run finishes, or with its current state after ``timeout``.
+    await run_in_db(_ensure_owned_run, db, run_id, current_user.id)
+    # Hand the request's connection back to the pool instead of pinning it while waiting.
+    await run_in_db(db.close)
+    run = await wait_for_run(run_id, timeout)
+    if run is None:
+        raise HTTPException(status_code=404, detail="Run not found")
+    return run
+
+
+@router.get("/crawl-runs/{run_id}/events")
+async def crawl_run_events(
+    run_id: UUID,
+    request: Request,
+    *,
+    db: Session = Depends(deps.get_db),
+    current_user=Depends(deps.get_current_user),
+):
+    # Server-Sent Events: a ``status`` event on every status change and a final ``run`` event
+    # carrying the finished run, after which the stream ends.
+    await run_in_db(_ensure_owned_run, db, run_id, current_user.id)
+    # Hand the request's connection back to the pool instead of pinning it while waiting.
+    await run_in_db(db.close)
+
+    async def events():
+        last_status = None
+        last_sent = time.monotonic()
+        while not await request.is_disconnected():
+            status = await run_in_session(run_status, run_id)
+            if status is None:
+                return
+            if status in TERMINAL_RUN_STATUSES:
+                run = await run_in_session(load_run, run_id)
+                if run is not None:
+                    # None when the run was deleted in between (e.g. with its keyword).
+                    yield _sse("run", run.model_dump_json())
+                return
+            if status != last_status:
+                yield _sse("status", json.dumps({"id": str(run_id), "status": status}))
+                last_status, last_sent = status, time.monotonic()
+            elif time.monotonic() - last_sent >= EVENT_KEEPALIVE_SECONDS:
+                yield ": keep-alive\n\n"
+                last_sent = time.monotonic()
+            await asyncio.sleep(EVENT_POLL_SECONDS)
+
+    return StreamingResponse(
+        events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+def _sse(event: str, data: str) -> str:
+    return f"event: {event}\ndata: {data}\n\n"
+
+
+def _create_batch(db: Session, user_id: UUID, payload: CrawlBatchCreate):
+    if payload.keyword_ids is not None:
+        owned = crud_batch.select_keyword_ids(db, user_id, keyword_ids=payload.keyword_ids)
+        if len(owned) != len(set(payload.keyword_ids)):
+            raise HTTPException(status_code=404, detail="Keyword not found")
+    status = payload.status
+    if payload.keyword_ids is None and status is None:
+        # Selecting by filters only: crawl active keywords, as the scheduler does, not paused or archived ones.
+        status = "active"
+    keyword_ids = crud_batch.select_keyword_ids(
+        db, user_id, keyword_ids=payload.keyword_ids, category=payload.category, status=status
+    )
+    if not keyword_ids:
+        raise HTTPException(status_code=400, detail="No keywords selected")
+    filters = {"category": payload.category, "status": status}
+    filters = {key: value for key, value in filters.items() if value is not None} or None
+    use_cache = not payload.refresh
+    fresh_seconds = settings.crawler_crawl_freshness_seconds if use_cache else None
+    batch = crud_batch.create(db, user_id, keyword_ids, use_cache, filters, fresh_seconds)
+    return _batch_progress(db, batch)
+
+
+def _get_owned_batch(db: Session, batch_id: UUID, user_id: UUID):
+    batch = crud_batch.get(db, batch_id)
+    if not batch or batch.owner_id != user_id:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    return batch
+
+
+def _batch_progress(db: Session, batch) -> CrawlBatch:
+    statuses, flags = crud_batch.progress(db, batch.id)
+    # Judged by the runs still open, not against total: items of keywords deleted since cascade away.
+    unfinished = statuses.get("pending", 0) + statuses.get("running", 0)
+    return CrawlBatch(
+        id=batch.id,
+        created_at=batch.created_at,
+        filters=batch.filters,
+        use_cache=batch.use_cache,
+        total=batch.total,
+        pending=statuses.get("pending", 0),
+        running=statuses.get("running", 0),
+        success=statuses.get("success", 0),
+        failure=statuses.get("failure", 0),
+        flags=flags,
+        completed=unfinished == 0,
+    )
+
+
+@router.post("/crawl-batches", response_model=CrawlBatch, status_code=202)
+async def create_crawl_batch(
+    payload: CrawlBatchCreate,
+    *,
+    db: Session = Depends(deps.get_db),
+    current_user=Depends(deps.get_current_user),
+):
+    # One bulk enqueue for the whole selection; the crawl workers pick the jobs up like any other,
+    # sharing their HTTP client, compiled matchers and HTTPS-check cache across the batch.
+    return await run_in_db(_create_batch, db, current_user.id, payload)
+
+
+@router.get("/crawl-batches/{batch_id}", response_model=CrawlBatch)
+def get_crawl_batch(
+    batch_id: UUID, *, db: Session = Depends(deps.get_db), current_user=Depends(deps.get_current_user)
+):
+    return _batch_progress(db, _get_owned_batch(db, batch_id, current_user.id))
+
+
+@router.get("/crawl-batches/{batch_id}/results", response_model=List[CrawlBatchResult])
+def get_crawl_batch_results(
+    batch_id: UUID,
+    *,
+    db: Session = Depends(deps.get_db),
+    current_user=Depends(deps.get_current_user),
+    skip: int = 0,
+    limit: int = Query(default=100, le=500),
+):
+    _get_owned_batch(db, batch_id, current_user.id)
+    rows = crud_batch.get_results(db, batch_id, skip=skip, limit=limit)
+    return [CrawlBatchResult(**row._asdict()) for row in rows]
@@ -7,7 +7,6 @@ from sqlalchemy.orm import Session
 from app.api import deps
 from app.crud import crawl as crud_crawl
 from app.crud import keyword as crud_keyword
-from app.models.crawl import CrawlRun
 from app.models.keyword import Keyword
 from app.schemas.keyword import KeywordCreate, KeywordDetail, KeywordSummary, KeywordUpdate
 
@@ -22,23 +21,9 @@ def list_keywords(
     skip: int = 0,
     limit: int = Query(default=100, le=200),
 ) -> List[KeywordSummary]:
+    # latest_flag / latest_run_at are columns on keywords, so this stays one query per page.
     keywords = crud_keyword.get_multi(db, owner_id=current_user.id, skip=skip, limit=limit)
-    summaries: List[KeywordSummary] = []
-    for item in keywords:
-        latest_run = (
-            db.query(CrawlRun)
-            .filter(CrawlRun.keyword_id == item.id, CrawlRun.status == "success")
-            .order_by(CrawlRun.started_at.desc())
-            .first()
-        )
-        summaries.append(
-            KeywordSummary(
-                **KeywordSummary.model_validate(item).model_dump(),
-                latest_flag=latest_run.flag if latest_run else None,
-                latest_run_at=latest_run.completed_at if latest_run else None,
-            )
-        )
-    return summaries
+    return [KeywordSummary.model_validate(item) for item in keywords]
 
 
 @router.post("", response_model=KeywordSummary, status_code=201)
@@ -81,17 +66,7 @@ def update_keyword(
 ) -> KeywordSummary:
     keyword = _get_owned_keyword(db, keyword_id, current_user.id)
     keyword = crud_keyword.update(db, keyword=keyword, obj_in=payload)
-    latest_run = (
-        db.query(CrawlRun)
-        .filter(CrawlRun.keyword_id == keyword.id, CrawlRun.status == "success")
-        .order_by(CrawlRun.started_at.desc())
-        .first()
-    )
-    return KeywordSummary(
-        **KeywordSummary.model_validate(keyword).model_dump(),
-        latest_flag=latest_run.flag if latest_run else None,
-        latest_run_at=latest_run.completed_at if latest_run else None,
-    )
+    return KeywordSummary.model_validate(keyword)
 
 
 @router.delete("/{keyword_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -1,6 +1,6 @@
 from pydantic_settings import BaseSettings
 from pydantic import AnyHttpUrl, validator
-from typing import List, Optional
+from typing import List, Literal, Optional
 
 
 class Settings(BaseSettings):
@@ -8,6 +8,7 @@ class Settings(BaseSettings):
     api_v1_prefix: str = "/api/v1"
 
     database_url: str = "postgresql+psycopg2://postgres:postgres@db:5432/crank_king"
+    database_pool_size: int = 10
 
     secret_key: str = "change-me"
     access_token_expire_minutes: int = 60 * 12
@@ -15,8 +16,55 @@ class Settings(BaseSettings):
 
     backend_cors_origins: List[AnyHttpUrl] | List[str] = []
 
+    naver_search_url: str = "https://search.naver.com/search.naver"
+    crawler_replay_url: Optional[str] = None
+
     crawler_user_agent: str = "Mozilla/5.0 (compatible; CrankKingBot/1.0)"
-    crawler_delay_seconds: float = 2.0
+    crawler_concurrency: int = 4
+    crawler_naver_rate: float = 0.5
+    # Deprecated: the fixed delay between Naver requests from before the token bucket. Still read
+    # so old .env files keep working: when CRAWLER_NAVER_RATE is not set it becomes 1 / delay.
+    crawler_delay_seconds: Optional[float] = None
+    crawler_naver_burst: float = 2.0
+    crawler_naver_min_rate: float = 0.05
+    crawler_naver_max_in_flight: int = 8
+    crawler_max_retries: int = 3
+    crawler_retry_backoff_seconds: float = 2.0
+    crawler_breaker_threshold: int = 5
+    crawler_breaker_cooldown_seconds: float = 60.0
+    crawler_host_rate: float = 0.5
+    crawler_host_burst: float = 1.0
+    crawler_host_max_in_flight: int = 2
+    crawler_https_concurrency: int = 16
+    crawler_https_check_mode: str = "get"
+    crawler_pool_size: int = 20
+    crawler_keepalive_connections: int = 20
+    crawler_keepalive_expiry: float = 60.0
+    crawler_http2: bool = True
+    crawler_html_parser: Literal["auto", "lxml", "html.parser"] = "auto"
+    crawler_stream_serp: bool = True
+    crawler_max_pages: int = 2
+    crawler_https_cache_ttl_seconds: int = 6 * 60 * 60
+    crawler_https_cache_max_entries: int = 50_000
+    crawler_cache_dir: Optional[str] = None
+    crawler_cache_ttl_seconds: int = 60 * 60
+    crawler_cache_max_bytes: int = 512 * 1024 * 1024
+    crawler_embedded_worker: bool = True
+    crawler_job_lease_seconds: float = 120.0
+    crawler_job_poll_seconds: float = 2.0
+    crawler_job_max_attempts: int = 3
+    crawler_shutdown_grace_seconds: float = 20.0
+    crawler_crawl_freshness_seconds: float = 300.0
+    crawler_schedule_mode: str = "cron"
+    crawler_schedule_window_start_hour: int = 0
+    crawler_schedule_window_hours: float = 24.0
+    crawler_schedule_shards: int = 1
+    crawler_schedule_shard: int = 0
+    crawler_schedule_tick_seconds: int = 60
+    crawler_recrawl_min_hours: float = 4.0
+    crawler_recrawl_max_hours: float = 7 * 24.0
+    crawler_volatility_alpha: float = 0.3
+    crawler_daily_request_budget: int = 0
 
     class Config:
         env_file = ".env"
@@ -28,5 +76,11 @@ class Settings(BaseSettings):
             return [i.strip() for i in v.split(",") if i.strip()]
         return v
 
+    @property
+    def naver_rate(self) -> float:
+        if "crawler_naver_rate" not in self.model_fields_set and self.crawler_delay_seconds:
+            return 1.0 / self.crawler_delay_seconds
+        return self.crawler_naver_rate
+
 
 settings = Settings()
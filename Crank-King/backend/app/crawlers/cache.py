@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import time
+import zlib
+from pathlib import Path
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from app.core.config import settings
+
+
+def normalize_url(url: str) -> str:
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or "/", query, ""))
+
+
+class SerpCache:
+    # Bodies are zlib-compressed files named by the SHA-256 of the normalized URL.
+    # mtime marks when a body was stored (TTL), atime when it was last read (LRU eviction).
+
+    def __init__(self, directory: str | Path, ttl_seconds: float, max_bytes: int) -> None:
+        self.directory = Path(directory)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._size: Optional[int] = None
+
+    def _path(self, url: str) -> Path:
+        digest = hashlib.sha256(normalize_url(url).encode("utf-8")).hexdigest()
+        return self.directory / digest[:2] / f"{digest}.html.z"
+
+    def get(self, url: str) -> Optional[str]:
+        path = self._path(url)
+        try:
+            stat = path.stat()
+            if time.time() - stat.st_mtime > self.ttl_seconds:
+                self._remove(path, stat.st_size)
+                self.misses += 1
+                return None
+            html = zlib.decompress(path.read_bytes()).decode("utf-8")
+            os.utime(path, (time.time(), stat.st_mtime))
+        except (OSError, zlib.error, UnicodeDecodeError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return html
+
+    def set(self, url: str, html: str) -> None:
+        path = self._path(url)
+        data = zlib.compress(html.encode("utf-8"), 6)
+        size = self._current_size()
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            previous = path.stat().st_size if path.exists() else 0
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            return
+        self._size = size - previous + len(data)
+        if self._size > self.max_bytes:
+            self._evict()
+
+    def stats(self) -> dict:
+        # Counters are per process, since it started; reported by GET /health.
+        return {"hits": self.hits, "misses": self.misses, "bytes": self._current_size()}
+
+    def _current_size(self) -> int:
+        if self._size is None:
+            self._size = sum(size for _, _, size in self._entries())
+        return self._size
+
+    def _entries(self):
+        for path in self.directory.glob("*/*.html.z"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            yield path, stat.st_atime, stat.st_size
+
+    def _evict(self) -> None:
+        entries = sorted(self._entries(), key=lambda item: item[1])
+        total = sum(size for _, _, size in entries)
+        for path, _, size in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+        self._size = total
+
+    def _remove(self, path: Path, size: int) -> None:
+        try:
+            path.unlink()
+        except OSError:
+            return
+        if self._size is not None:
+            self._size -= size
+
+
+serp_cache: Optional[SerpCache] = (
+    SerpCache(settings.crawler_cache_dir, settings.crawler_cache_ttl_seconds, settings.crawler_cache_max_bytes)
+    if settings.crawler_cache_dir
+    else None
+)
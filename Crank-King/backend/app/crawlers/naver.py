@@ -1,19 +1,49 @@
 from __future__ import annotations
 
+import asyncio
+import codecs
 import json
+import random
+import re
 from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
 from html import unescape
 from typing import Iterable, Iterator, List, Optional
 from urllib.parse import urlencode
 
 import httpx
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml  # noqa: F401
+except ImportError:  # pragma: no cover
+    lxml = None
 
 from app.core.config import settings
+from app.crawlers.cache import serp_cache
+from app.services.http_clients import http_clients
+from app.services.rate_limiter import naver_controller
 
 BASE_SEARCH_URL = "https://search.naver.com/search.naver"
+MAX_CRAWL_DEPTH = 5
 WEB_SERP_ANCHOR = '"data-slog-container":"web_lis"'
 
+MAIN_PACK_MARKER = 'id="main_pack"'
+
+_JSON_DECODER = json.JSONDecoder()
+
+# Plain tags without quoted attributes; anything else goes through BeautifulSoup.
+_SIMPLE_TAG_RE = re.compile(r"</?([A-Za-z][A-Za-z0-9]*)[^<>\"']*>")
+_ENTITY_LIKE_RE = re.compile(r"&[A-Za-z#]")
+# The rest of a JSON string: up to its closing quote, or a trailing backslash, or the end of the text.
+_JSON_STRING_REST_RE = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*("|\\)?', re.S)
+# Everything up to the next brace, including whole strings; stops at a string left open.
+_JSON_SKIP_RE = re.compile(r'(?:[^{}"]+|"[^"\\]*(?:\\.[^"\\]*)*")*', re.S)
+_NON_TEXT_TAGS = frozenset({"script", "style", "template", "textarea", "title"})
+_STRIP_CACHE_SIZE = 4096
+
 
 @dataclass
 class SerpEntryData:
@@ -42,35 +72,168 @@ def build_search_urls(query: str, pages: Iterable[int] = (1, 2)) -> List[str]:
             "start": start,
             "page": page,
         }
-        urls.append(f"{BASE_SEARCH_URL}?{urlencode(params)}")
+        urls.append(f"{search_base_url()}?{urlencode(params)}")
     return urls
 
 
-async def fetch_serp(client: httpx.AsyncClient, url: str) -> str:
-    response = await client.get(url, timeout=15.0)
-    response.raise_for_status()
-    return response.text
+def search_base_url() -> str:
+    # Replay mode points crawls at the local stand-in server (app.crawlers.standin).
+    return settings.crawler_replay_url or settings.naver_search_url or BASE_SEARCH_URL
+
+
+async def fetch_serp(client: httpx.AsyncClient, url: str, stream: Optional[bool] = None) -> str:
+    if stream is None:
+        stream = settings.crawler_stream_serp
+    attempt = 0
+    while True:
+        retry_after: Optional[float] = None
+        async with naver_controller.request() as sent_at:
+            try:
+                html = await _fetch_serp_once(client, url, stream)
+            except httpx.HTTPStatusError as exc:
+                if not _is_throttling(exc.response.status_code) or attempt >= settings.crawler_max_retries:
+                    await _report_failure(exc.response, sent_at)
+                    raise
+                retry_after = _retry_after_seconds(exc.response)
+                await naver_controller.on_failure(retry_after, sent_at)
+            except httpx.TransportError:
+                await naver_controller.on_failure(sent_at=sent_at)
+                if attempt >= settings.crawler_max_retries:
+                    raise
+            else:
+                await naver_controller.on_success()
+                return html
+        backoff = settings.crawler_retry_backoff_seconds * (2**attempt) * random.uniform(0.5, 1.5)
+        await asyncio.sleep(max(backoff, retry_after or 0.0))
+        attempt += 1
+
+
+def _is_throttling(status_code: int) -> bool:
+    return status_code == 429 or status_code >= 500
+
+
+async def _report_failure(response: httpx.Response, sent_at: Optional[float] = None) -> None:
+    if _is_throttling(response.status_code):
+        await naver_controller.on_failure(_retry_after_seconds(response), sent_at)
+
+
+def _retry_after_seconds(response: httpx.Response) -> Optional[float]:
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+async def _fetch_serp_once(client: httpx.AsyncClient, url: str, stream: bool) -> str:
+    if not stream:
+        response = await client.get(url, timeout=15.0)
+        response.raise_for_status()
+        return response.text
+
+    async with client.stream("GET", url, timeout=15.0) as response:
+        response.raise_for_status()
+        return await _read_until_payload(response)
+
+
+async def _read_until_payload(response: httpx.Response) -> str:
+    # Returns the page up to the end of the web_lis payload, which parse_serp handles exactly
+    # like the full page; leaving the stream context early drops the rest of the body.
+    # Without a payload the whole page is buffered for the DOM path.
+    # Each chunk is scanned once: for the anchor, then by the resumable brace scanner; the payload
+    # is only decoded when its closing brace has arrived.
+    decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")(errors="replace")
+    pieces: List[str] = []
+    tail = ""
+    start = 0
+    scanner: Optional[_JsonObjectScanner] = None
+    searching = True
+    async for chunk in response.aiter_bytes():
+        text = decoder.decode(chunk)
+        pieces.append(text)
+        if not searching:
+            continue
+        if scanner is None:
+            window = tail + text
+            tail = window[1 - len(WEB_SERP_ANCHOR) :]
+            if WEB_SERP_ANCHOR not in window:
+                continue
+            html = "".join(pieces)
+            located = _locate_web_payload(html)
+            if located is None:
+                searching = False
+                continue
+            start = located
+            scanner = _JsonObjectScanner()
+            length = scanner.feed(html, start)
+        else:
+            length = scanner.feed(text)
+        if length is None:
+            continue
+        html = "".join(pieces)
+        try:
+            _, end = _JSON_DECODER.raw_decode(html, start)
+        except json.JSONDecodeError:
+            # Balanced but not valid JSON: keep the whole page for parse_serp's fallbacks.
+            searching = False
+            continue
+        return html[:end]
+    pieces.append(decoder.decode(b"", final=True))
+    return "".join(pieces)
 
 
 def parse_serp(html: str, query: str, page_number: int) -> SerpPageData:
     payload = _extract_web_payload(html)
     if payload is None:
-        soup = BeautifulSoup(html, "html.parser")
+        soup = _build_result_soup(html)
         entries = list(_extract_entries_from_dom(soup, page_number))
     else:
         entries = list(_extract_entries_from_payload(payload, page_number))
     return SerpPageData(keyword=query, page_number=page_number, entries=entries)
 
 
-async def crawl_keyword(query: str) -> List[SerpPageData]:
-    urls = build_search_urls(query)
-    pages: List[SerpPageData] = []
-    headers = {"User-Agent": settings.crawler_user_agent}
-    async with httpx.AsyncClient(headers=headers) as client:
-        for page_number, url in enumerate(urls, start=1):
-            html = await fetch_serp(client, url)
-            pages.append(parse_serp(html, query, page_number))
-    return pages
+def resolve_crawl_depth(depth: Optional[int] = None) -> int:
+    return max(1, min(depth or settings.crawler_max_pages, MAX_CRAWL_DEPTH))
+
+
+async def crawl_keyword(
+    query: str,
+    client: Optional[httpx.AsyncClient] = None,
+    use_cache: bool = True,
+    depth: Optional[int] = None,
+) -> List[SerpPageData]:
+    client = client or http_clients.client
+    page_numbers = range(1, resolve_crawl_depth(depth) + 1)
+    urls = build_search_urls(query, page_numbers)
+
+    async def crawl_page(page_number: int, url: str) -> SerpPageData:
+        html = await fetch_serp_cached(client, url, use_cache=use_cache)
+        return parse_serp(html, query, page_number)
+
+    # Pages are fetched concurrently (still paced by naver_controller); gather keeps page order.
+    return list(await asyncio.gather(*(crawl_page(number, url) for number, url in zip(page_numbers, urls))))
+
+
+async def fetch_serp_cached(client: httpx.AsyncClient, url: str, use_cache: bool = True) -> str:
+    # use_cache=False skips the lookup but still refreshes the stored body.
+    if serp_cache is None:
+        return await fetch_serp(client, url)
+    if use_cache:
+        html = await asyncio.to_thread(serp_cache.get, url)
+        if html is not None:
+            return html
+    html = await fetch_serp(client, url)
+    await asyncio.to_thread(serp_cache.set, url, html)
+    return html
 
 
 def _extract_entries_from_payload(payload: dict, page_number: int) -> Iterator[SerpEntryData]:
@@ -121,11 +284,40 @@ def _strip_html(raw: str | dict | None) -> str:
         text = raw.get("text", "")
     elif isinstance(raw, str):
         text = raw
-    soup = BeautifulSoup(unescape(text), "html.parser")
+    return _strip_markup(text)
+
+
+@lru_cache(maxsize=_STRIP_CACHE_SIZE)
+def _strip_markup(text: str) -> str:
+    decoded = unescape(text)
+    if "&" in decoded and _ENTITY_LIKE_RE.search(decoded):
+        return _strip_markup_with_soup(decoded)
+
+    pieces: List[str] = []
+    pos = 0
+    for match in _SIMPLE_TAG_RE.finditer(decoded):
+        if match.group(1).lower() in _NON_TEXT_TAGS:
+            return _strip_markup_with_soup(decoded)
+        pieces.append(decoded[pos : match.start()])
+        pos = match.end()
+    pieces.append(decoded[pos:])
+
+    stripped: List[str] = []
+    for piece in pieces:
+        if "<" in piece:
+            return _strip_markup_with_soup(decoded)
+        piece = piece.strip()
+        if piece:
+            stripped.append(piece)
+    return " ".join(stripped)
+
+
+def _strip_markup_with_soup(decoded: str) -> str:
+    soup = BeautifulSoup(decoded, "html.parser")
     return soup.get_text(separator=" ", strip=True)
 
 
-def _extract_web_payload(html: str) -> Optional[dict]:
+def _locate_web_payload(html: str) -> Optional[int]:
     anchor_idx = html.find(WEB_SERP_ANCHOR)
     if anchor_idx == -1:
         return None
@@ -136,6 +328,22 @@ def _extract_web_payload(html: str) -> Optional[dict]:
     start = html.find("{", bootstrap_idx)
     if start == -1:
         return None
+    return start
+
+
+def _extract_web_payload(html: str) -> Optional[dict]:
+    start = _locate_web_payload(html)
+    if start is None:
+        return None
+
+    # raw_decode parses straight from the offset and stops at the end of the object,
+    # so the page is scanned once in C; the Python scanner only covers odd markup.
+    try:
+        payload, _ = _JSON_DECODER.raw_decode(html, start)
+    except json.JSONDecodeError:
+        payload = None
+    if isinstance(payload, dict):
+        return payload
 
     json_str = _consume_balanced_json(html, start)
     if not json_str:
@@ -147,30 +355,74 @@ def _extract_web_payload(html: str) -> Optional[dict]:
 
 
 def _consume_balanced_json(text: str, start: int) -> Optional[str]:
-    stack = 0
-    end = start
-    length = len(text)
-    while end < length:
-        ch = text[end]
-        if ch == '"':
-            end += 1
-            while end < length:
-                ch2 = text[end]
-                if ch2 == '\\':
-                    end += 2
-                    continue
-                if ch2 == '"':
-                    break
-                end += 1
-        if ch == "{":
-            stack += 1
-        elif ch == "}":
-            stack -= 1
-            if stack == 0:
-                end += 1
-                return text[start:end]
-        end += 1
-    return None
+    length = _JsonObjectScanner().feed(text, start)
+    if length is None:
+        return None
+    return text[start : start + length]
+
+
+class _JsonObjectScanner:
+    # Finds the brace closing a JSON object that arrives in pieces. Depth and string state carry
+    # over between feeds, so every piece is scanned once; strings are skipped by regex.
+
+    def __init__(self) -> None:
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+        self.scanned = 0
+
+    def feed(self, text: str, pos: int = 0) -> Optional[int]:
+        # Length of the object up to its closing brace, counted from the first character fed,
+        # or None while it is still open.
+        length = len(text)
+        offset = self.scanned - pos
+        if self.in_string and pos < length:
+            if self.escaped:
+                self.escaped = False
+                pos += 1
+            match = _JSON_STRING_REST_RE.match(text, pos)
+            pos = match.end()
+            self._end_string(match.group(1))
+        depth = self.depth
+        while not self.in_string:
+            pos = _JSON_SKIP_RE.match(text, pos).end()
+            if pos == length:
+                break
+            char = text[pos]
+            if char == '"':
+                match = _JSON_STRING_REST_RE.match(text, pos + 1)
+                pos = match.end()
+                self._end_string(match.group(1))
+                continue
+            pos += 1
+            depth += 1 if char == "{" else -1
+            if depth == 0:
+                return offset + pos
+        self.depth = depth
+        self.scanned = offset + length
+        return None
+
+    def _end_string(self, closing: Optional[str]) -> None:
+        # A string left open runs to the end of the piece, maybe stopping on a backslash.
+        self.in_string = closing != '"'
+        self.escaped = closing == "\\"
+
+
+def _dom_parser_features() -> str:
+    if settings.crawler_html_parser != "auto":
+        return settings.crawler_html_parser
+    return "lxml" if lxml is not None else "html.parser"
+
+
+def _build_result_soup(html: str) -> BeautifulSoup:
+    features = _dom_parser_features()
+    marker_idx = html.find(MAIN_PACK_MARKER)
+    tag_start = html.rfind("<", 0, marker_idx) if marker_idx != -1 else -1
+    if tag_start == -1:
+        return BeautifulSoup(html, features)
+    # Results only live under #main_pack: skip tokenizing the <head>/header markup before it
+    # and only build the tree for that subtree.
+    return BeautifulSoup(html[tag_start:], features, parse_only=SoupStrainer(id="main_pack"))
 
 
 def _extract_entries_from_dom(soup: BeautifulSoup, page_number: int) -> Iterator[SerpEntryData]:
@@ -201,14 +453,25 @@ def _extract_entries_from_dom(soup: BeautifulSoup, page_number: int) -> Iterator
 
 
 def _iter_result_nodes(soup: BeautifulSoup) -> Iterator[BeautifulSoup]:
-    selectors = [
-        "div.total_group > div.total_wrap",
-        "div#main_pack div.total_wrap",
-        "div#main_pack li.bx",
-    ]
-    for selector in selectors:
-        matched = soup.select(selector)
-        if matched:
-            for node in matched:
-                yield node
-            return
+    # Same precedence as trying "div.total_group > div.total_wrap", "div#main_pack div.total_wrap"
+    # and "div#main_pack li.bx" in turn, but with one walk over the tree instead of three.
+    main_pack = soup.find("div", id="main_pack")
+    if main_pack is None:
+        yield from soup.select("div.total_group > div.total_wrap")
+        return
+
+    wraps: List[BeautifulSoup] = []
+    items: List[BeautifulSoup] = []
+    for node in main_pack.find_all(_is_result_node):
+        (wraps if node.name == "div" else items).append(node)
+
+    grouped = [node for node in wraps if _has_class(node.parent, "div", "total_group")]
+    yield from grouped or wraps or items
+
+
+def _is_result_node(tag) -> bool:
+    return _has_class(tag, "div", "total_wrap") or _has_class(tag, "li", "bx")
+
+
+def _has_class(tag, name: str, class_name: str) -> bool:
+    return tag is not None and tag.name == name and class_name in (tag.get("class") or ())
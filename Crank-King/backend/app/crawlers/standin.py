@@ -0,0 +1,121 @@
+"""Local Naver stand-in serving the recorded docs/samples pages.
+
+    python -m app.crawlers.standin --port 8900 --latency-ms 80 --jitter-ms 40 --error-rate 0.01 --throttle-rate 0.02
+
+Point crawls at it with CRAWLER_REPLAY_URL=http://127.0.0.1:8900/search.naver.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional
+
+from fastapi import FastAPI
+from fastapi.responses import HTMLResponse, JSONResponse, Response
+
+from app.crawlers.naver import WEB_SERP_ANCHOR
+
+DEFAULT_SAMPLES_DIR = Path(__file__).resolve().parents[3] / "docs" / "samples"
+PAGE_SAMPLES = ["bundang_page1_web.html", "bundang_page2_web.html"]
+
+
+@dataclass
+class StandInConfig:
+    samples_dir: Path = DEFAULT_SAMPLES_DIR
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    throttle_rate: float = 0.0
+    retry_after_seconds: int = 5
+    dom_rate: float = 0.0
+    seed: Optional[int] = None
+
+
+@dataclass
+class StandInState:
+    config: StandInConfig
+    pages: List[str]
+    dom_pages: List[str]
+    rng: random.Random
+    counters: Counter = field(default_factory=Counter)
+
+
+def load_pages(samples_dir: Path) -> List[str]:
+    return [(samples_dir / name).read_text(encoding="utf-8") for name in PAGE_SAMPLES]
+
+
+def create_app(config: Optional[StandInConfig] = None) -> FastAPI:
+    config = config or StandInConfig()
+    pages = load_pages(config.samples_dir)
+    state = StandInState(
+        config=config,
+        pages=pages,
+        # Same markup without the bootstrap anchor, so parse_serp takes the DOM path.
+        dom_pages=[page.replace(WEB_SERP_ANCHOR, '"data-slog-container":"replay"') for page in pages],
+        rng=random.Random(config.seed),
+    )
+    app = FastAPI(title="Naver stand-in")
+    app.state.standin = state
+
+    @app.get("/search.naver")
+    async def search(page: int = 1) -> Response:
+        state.counters["requests"] += 1
+        delay = config.latency_ms + state.rng.uniform(-config.jitter_ms, config.jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+
+        roll = state.rng.random()
+        if roll < config.throttle_rate:
+            state.counters["429"] += 1
+            return Response(status_code=429, headers={"Retry-After": str(config.retry_after_seconds)})
+        if roll < config.throttle_rate + config.error_rate:
+            state.counters["5xx"] += 1
+            return Response(status_code=503)
+
+        source = state.dom_pages if state.rng.random() < config.dom_rate else state.pages
+        state.counters["200"] += 1
+        return HTMLResponse(source[(max(page, 1) - 1) % len(source)])
+
+    @app.get("/_stats")
+    async def stats() -> JSONResponse:
+        return JSONResponse(dict(state.counters))
+
+    return app
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--samples-dir", type=Path, default=DEFAULT_SAMPLES_DIR)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of 503 responses")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="fraction of 429 responses")
+    parser.add_argument("--retry-after", type=int, default=5, help="Retry-After seconds sent with 429s")
+    parser.add_argument("--dom-rate", type=float, default=0.0, help="fraction of pages served without the payload")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    config = StandInConfig(
+        samples_dir=args.samples_dir,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        retry_after_seconds=args.retry_after,
+        dom_rate=args.dom_rate,
+        seed=args.seed,
+    )
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID, uuid4
+
+from sqlalchemy import func, insert
+from sqlalchemy.orm import Session
+
+from app.crud import job as crud_job
+from app.models.crawl import CrawlBatch, CrawlBatchItem, CrawlRun
+from app.models.keyword import Keyword
+
+
+def select_keyword_ids(
+    db: Session,
+    owner_id: UUID,
+    keyword_ids: Optional[List[UUID]] = None,
+    category: Optional[str] = None,
+    status: Optional[str] = None,
+) -> List[UUID]:
+    query = db.query(Keyword.id).filter(Keyword.owner_id == owner_id)
+    if keyword_ids is not None:
+        query = query.filter(Keyword.id.in_(keyword_ids))
+    if category is not None:
+        query = query.filter(Keyword.category == category)
+    if status is not None:
+        query = query.filter(Keyword.status == status)
+    return [keyword_id for (keyword_id,) in query.order_by(Keyword.created_at)]
+
+
+def create(
+    db: Session,
+    owner_id: UUID,
+    keyword_ids: List[UUID],
+    use_cache: bool = True,
+    filters: Optional[dict] = None,
+    fresh_seconds: Optional[float] = None,
+) -> CrawlBatch:
+    # All keywords go through one bulk enqueue, so a keyword already queued, running or fresh is
+    # attached to that run instead of being crawled twice. Jobs and batch rows commit together:
+    # no job is queued for a batch that was never recorded.
+    crawls = crud_job.enqueue(
+        db, [(keyword_id, None) for keyword_id in keyword_ids], "batch", use_cache, fresh_seconds, commit=False
+    )
+    batch_id = uuid4()
+    db.execute(
+        insert(CrawlBatch),
+        [
+            {
+                "id": batch_id,
+                "owner_id": owner_id,
+                "filters": filters,
+                "use_cache": use_cache,
+                "total": len(crawls),
+                "created_at": datetime.utcnow(),
+            }
+        ],
+    )
+    if crawls:
+        db.execute(
+            insert(CrawlBatchItem),
+            [
+                {"batch_id": batch_id, "keyword_id": crawl.keyword_id, "crawl_run_id": crawl.crawl_run_id}
+                for crawl in crawls
+            ],
+        )
+    db.commit()
+    return db.get(CrawlBatch, batch_id)
+
+
+def get(db: Session, batch_id: UUID) -> Optional[CrawlBatch]:
+    return db.query(CrawlBatch).filter(CrawlBatch.id == batch_id).first()
+
+
+def progress(db: Session, batch_id: UUID) -> Tuple[Dict[str, int], Dict[str, int]]:
+    # Run counts by status and, among finished runs, by flag: one grouped query over the batch.
+    rows = (
+        db.query(CrawlRun.status, CrawlRun.flag, func.count())
+        .join(CrawlBatchItem, CrawlBatchItem.crawl_run_id == CrawlRun.id)
+        .filter(CrawlBatchItem.batch_id == batch_id)
+        .group_by(CrawlRun.status, CrawlRun.flag)
+    )
+    statuses: Dict[str, int] = {}
+    flags: Dict[str, int] = {}
+    for status, flag, count in rows:
+        statuses[status] = statuses.get(status, 0) + count
+        if flag is not None:
+            flags[flag] = flags.get(flag, 0) + count
+    return statuses, flags
+
+
+def get_results(db: Session, batch_id: UUID, skip: int = 0, limit: int = 100) -> List[tuple]:
+    return (
+        db.query(
+            CrawlBatchItem.keyword_id,
+            Keyword.query,
+            CrawlRun.id.label("crawl_run_id"),
+            CrawlRun.status,
+            CrawlRun.flag,
+            CrawlRun.started_at,
+            CrawlRun.completed_at,
+            CrawlRun.https_issues,
+            CrawlRun.notes,
+        )
+        .join(Keyword, Keyword.id == CrawlBatchItem.keyword_id)
+        .join(CrawlRun, CrawlRun.id == CrawlBatchItem.crawl_run_id)
+        .filter(CrawlBatchItem.batch_id == batch_id)
+        .order_by(Keyword.query)
+        .offset(skip)
+        .limit(limit)
+        .all()
+    )
@@ -0,0 +1,127 @@
+from datetime import datetime
+from typing import Any, Iterable, Iterator, Optional, Sequence, Tuple
+from uuid import UUID, uuid4
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.crawlers.naver import SerpEntryData
+from app.models.crawl import HttpCheck, SerpEntry
+
+SERP_ENTRY_COLUMNS = (
+    "id",
+    "crawl_run_id",
+    "page",
+    "rank",
+    "title",
+    "display_url",
+    "landing_url",
+    "is_match",
+    "match_reason",
+)
+HTTP_CHECK_COLUMNS = (
+    "id",
+    "crawl_run_id",
+    "url",
+    "protocol",
+    "status_code",
+    "ssl_valid",
+    "ssl_error",
+    "error_category",
+    "cert_expires_at",
+    "from_cache",
+    "checked_at",
+)
+
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def serp_entry_row(
+    run_id: UUID, entry: SerpEntryData, is_match: bool = False, match_reason: Optional[str] = None
+) -> Tuple:
+    return (
+        uuid4(),
+        run_id,
+        entry.page,
+        entry.rank,
+        entry.title,
+        entry.display_url,
+        entry.landing_url,
+        is_match,
+        match_reason,
+    )
+
+
+def http_check_row(run_id: UUID, check: HttpCheck) -> Tuple:
+    return (
+        uuid4(),
+        run_id,
+        check.url,
+        check.protocol,
+        check.status_code,
+        check.ssl_valid,
+        check.ssl_error,
+        check.error_category,
+        check.cert_expires_at,
+        bool(check.from_cache),
+        check.checked_at or datetime.utcnow(),
+    )
+
+
+def copy_serp_entries(db: Session, rows: Iterable[Sequence[Any]]) -> int:
+    return copy_rows(db, SerpEntry, SERP_ENTRY_COLUMNS, rows)
+
+
+def copy_http_checks(db: Session, rows: Iterable[Sequence[Any]]) -> int:
+    return copy_rows(db, HttpCheck, HTTP_CHECK_COLUMNS, rows)
+
+
+def copy_rows(db: Session, model, columns: Sequence[str], rows: Iterable[Sequence[Any]]) -> int:
+    # Runs inside the session's transaction and does not commit. On psycopg2 the rows are
+    # streamed through COPY ... FROM STDIN; other drivers get a single executemany insert.
+    connection = db.connection()
+    if connection.dialect.name == "postgresql" and connection.dialect.driver == "psycopg2":
+        stream = _CopyStream(rows)
+        with connection.connection.dbapi_connection.cursor() as cursor:
+            cursor.copy_expert(f"COPY {model.__tablename__} ({', '.join(columns)}) FROM STDIN", stream)
+        return stream.count
+
+    params = [dict(zip(columns, row)) for row in rows]
+    if params:
+        db.execute(insert(model), params)
+    return len(params)
+
+
+class _CopyStream:
+    # File-like reader producing COPY text format lazily, so rows are never all held as text.
+
+    def __init__(self, rows: Iterable[Sequence[Any]]) -> None:
+        self._lines = self._encode(rows)
+        self._buffer = b""
+        self.count = 0
+
+    def _encode(self, rows: Iterable[Sequence[Any]]) -> Iterator[bytes]:
+        for row in rows:
+            self.count += 1
+            yield ("\t".join(_copy_value(value) for value in row) + "\n").encode("utf-8")
+
+    def read(self, size: int = -1) -> bytes:
+        while size < 0 or len(self._buffer) < size:
+            line = next(self._lines, None)
+            if line is None:
+                break
+            self._buffer += line
+        if size < 0:
+            size = len(self._buffer)
+        chunk, self._buffer = self._buffer[:size], self._buffer[size:]
+        return chunk
+
+
+def _copy_value(value: Any) -> str:
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value).translate(_COPY_ESCAPES)
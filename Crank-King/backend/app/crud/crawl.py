@@ -1,10 +1,14 @@
 from datetime import datetime
-from typing import List
+from typing import Any, List, Optional, Sequence
 from uuid import UUID
 
+from sqlalchemy import insert, or_, update
 from sqlalchemy.orm import Session, joinedload
 
+from app.crud import bulk
+from app.crud.job import Lease, hold_lease
 from app.models.crawl import CrawlRun, HttpCheck, SerpEntry
+from app.models.keyword import Keyword
 
 
 def create_run(db: Session, keyword_id: UUID) -> CrawlRun:
@@ -21,6 +25,7 @@ def mark_run_complete(db: Session, run: CrawlRun, flag: str, https_issues: dict
     run.flag = flag
     run.https_issues = https_issues
     db.add(run)
+    record_latest_run(db, run.keyword_id, run.id, run.started_at, run.completed_at, flag)
     db.commit()
     db.refresh(run)
     return run
@@ -46,10 +51,69 @@ def add_serp_entries(db: Session, run: CrawlRun, entries: List[SerpEntry]) -> No
 def add_http_checks(db: Session, run: CrawlRun, checks: List[HttpCheck]) -> None:
     if not checks:
         return
+    for check in checks:
+        check.crawl_run_id = run.id
     db.bulk_save_objects(checks)
     db.commit()
 
 
+def insert_run(db: Session, run_id: UUID, keyword_id: UUID, started_at: datetime, status: str = "running") -> None:
+    db.execute(insert(CrawlRun).values(id=run_id, keyword_id=keyword_id, started_at=started_at, status=status))
+    db.commit()
+
+
+def start_run(db: Session, run_id: UUID, started_at: datetime, lease: Optional[Lease] = None) -> None:
+    if lease is not None:
+        hold_lease(db, lease)
+    db.execute(
+        update(CrawlRun)
+        .where(CrawlRun.id == run_id)
+        .values(status="running", started_at=started_at, completed_at=None, flag=None, https_issues=None, notes=None)
+    )
+    db.commit()
+
+
+def finish_run(
+    db: Session,
+    run_id: UUID,
+    values: dict,
+    entries: List[Sequence[Any]],
+    checks: List[Sequence[Any]],
+    keyword_id: Optional[UUID] = None,
+    keyword_values: Optional[dict] = None,
+    started_at: Optional[datetime] = None,
+    lease: Optional[Lease] = None,
+) -> None:
+    # Entries, checks and the final run state land in one transaction, without reloading anything.
+    # Rows are tuples in bulk.SERP_ENTRY_COLUMNS / bulk.HTTP_CHECK_COLUMNS order.
+    if lease is not None:
+        hold_lease(db, lease)
+    if entries:
+        bulk.copy_serp_entries(db, entries)
+    if checks:
+        bulk.copy_http_checks(db, checks)
+    db.execute(update(CrawlRun).where(CrawlRun.id == run_id).values(**values))
+    if keyword_id is not None and keyword_values:
+        db.execute(update(Keyword).where(Keyword.id == keyword_id).values(**keyword_values))
+    if keyword_id is not None and started_at is not None and values.get("status") == "success":
+        record_latest_run(db, keyword_id, run_id, started_at, values["completed_at"], values.get("flag"))
+    db.commit()
+
+
+def record_latest_run(
+    db: Session, keyword_id: UUID, run_id: UUID, started_at: datetime, completed_at: datetime, flag: Optional[str]
+) -> None:
+    # Keeps the keyword's latest-run summary; a run that finishes after a newer one leaves it alone.
+    db.execute(
+        update(Keyword)
+        .where(
+            Keyword.id == keyword_id,
+            or_(Keyword.latest_run_started_at.is_(None), Keyword.latest_run_started_at <= started_at),
+        )
+        .values(latest_run_id=run_id, latest_flag=flag, latest_run_at=completed_at, latest_run_started_at=started_at)
+    )
+
+
 def get_recent_runs(db: Session, keyword_id: UUID, limit: int = 10) -> List[CrawlRun]:
     return (
         db.query(CrawlRun)
@@ -0,0 +1,257 @@
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+from uuid import UUID, uuid4
+
+from sqlalchemy import and_, insert, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.crawl import ACTIVE_JOB_INDEX, ACTIVE_JOB_STATUSES, CrawlJob, CrawlRun
+
+
+class ClaimedJob(NamedTuple):
+    id: UUID
+    keyword_id: UUID
+    crawl_run_id: UUID
+    use_cache: bool
+    attempts: int
+
+
+class Lease(NamedTuple):
+    # ``attempts`` is the fencing token: a reclaim bumps it, even when the same worker reclaims.
+    job_id: UUID
+    worker_id: str
+    attempts: int
+
+
+class LeaseLost(Exception):
+    pass
+
+
+class EnqueuedCrawl(NamedTuple):
+    keyword_id: UUID
+    crawl_run_id: UUID
+    job_id: Optional[UUID]
+    created_at: datetime
+    # False when the request was attached to a crawl already queued/running or recently finished.
+    created: bool
+
+
+def enqueue(
+    db: Session,
+    items: Iterable[Tuple[UUID, Optional[datetime]]],
+    source: str,
+    use_cache: bool = True,
+    fresh_seconds: Optional[float] = None,
+    commit: bool = True,
+) -> List[EnqueuedCrawl]:
+    # Single-flight per keyword, across processes: the partial unique index on active jobs is the
+    # arbiter, so a keyword with a queued or running job is attached to it instead of getting a
+    # second one. With ``fresh_seconds``, a success that recent is reused as well.
+    # Every new job gets its pending CrawlRun up front, so callers can hand out the run id at once.
+    # With ``commit=False`` the caller commits, so its own rows land in the same transaction.
+    now = datetime.utcnow()
+    wanted: Dict[UUID, Optional[datetime]] = {}
+    for keyword_id, run_after in items:
+        wanted.setdefault(keyword_id, run_after)
+    if not wanted:
+        return []
+
+    found = _existing_crawls(db, list(wanted), now, fresh_seconds)
+    new = [(keyword_id, run_after) for keyword_id, run_after in wanted.items() if keyword_id not in found]
+    if new:
+        runs, jobs = _job_rows(new, source, use_cache, now)
+        try:
+            with db.begin_nested():
+                db.execute(insert(CrawlRun), runs)
+                db.execute(insert(CrawlJob), jobs)
+        except IntegrityError:
+            # Lost a race with another enqueuer, or a keyword was deleted meanwhile; sort it out row by row.
+            jobs, lost = _insert_one_by_one(db, runs, jobs)
+            found.update(_existing_crawls(db, lost, now, None))
+        for job in jobs:
+            found[job["keyword_id"]] = EnqueuedCrawl(
+                job["keyword_id"], job["crawl_run_id"], job["id"], job["created_at"], True
+            )
+    if commit:
+        db.commit()
+    # Keywords that could not be queued (deleted meanwhile) are left out.
+    return [found[keyword_id] for keyword_id in wanted if keyword_id in found]
+
+
+def _existing_crawls(
+    db: Session, keyword_ids: List[UUID], now: datetime, fresh_seconds: Optional[float]
+) -> Dict[UUID, EnqueuedCrawl]:
+    found: Dict[UUID, EnqueuedCrawl] = {}
+    if not keyword_ids:
+        return found
+    active = db.query(CrawlJob.keyword_id, CrawlJob.crawl_run_id, CrawlJob.id, CrawlJob.created_at).filter(
+        CrawlJob.keyword_id.in_(keyword_ids), CrawlJob.status.in_(ACTIVE_JOB_STATUSES)
+    )
+    for keyword_id, run_id, job_id, created_at in active:
+        found[keyword_id] = EnqueuedCrawl(keyword_id, run_id, job_id, created_at, False)
+    remaining = [keyword_id for keyword_id in keyword_ids if keyword_id not in found]
+    if fresh_seconds and remaining:
+        fresh = (
+            db.query(CrawlRun.keyword_id, CrawlRun.id, CrawlRun.started_at)
+            .filter(
+                CrawlRun.keyword_id.in_(remaining),
+                CrawlRun.status == "success",
+                CrawlRun.completed_at >= now - timedelta(seconds=fresh_seconds),
+            )
+            .order_by(CrawlRun.completed_at)
+        )
+        for keyword_id, run_id, started_at in fresh:
+            found[keyword_id] = EnqueuedCrawl(keyword_id, run_id, None, started_at, False)
+    return found
+
+
+def _job_rows(
+    items: List[Tuple[UUID, Optional[datetime]]], source: str, use_cache: bool, now: datetime
+) -> Tuple[List[dict], List[dict]]:
+    runs: List[dict] = []
+    jobs: List[dict] = []
+    for keyword_id, run_after in items:
+        run_id = uuid4()
+        runs.append({"id": run_id, "keyword_id": keyword_id, "started_at": now, "status": "pending"})
+        jobs.append(
+            {
+                "id": uuid4(),
+                "keyword_id": keyword_id,
+                "crawl_run_id": run_id,
+                "status": "queued",
+                "source": source,
+                "use_cache": use_cache,
+                "run_after": run_after or now,
+                "attempts": 0,
+                "created_at": now,
+            }
+        )
+    return runs, jobs
+
+
+def _insert_one_by_one(db: Session, runs: List[dict], jobs: List[dict]) -> Tuple[List[dict], List[UUID]]:
+    # The inserted jobs, and the keywords whose insert hit the active-job index, i.e. another
+    # enqueuer got there first. Any other integrity error (a foreign key to a keyword deleted
+    # meanwhile) just leaves the keyword out.
+    inserted: List[dict] = []
+    lost: List[UUID] = []
+    for run, job in zip(runs, jobs):
+        try:
+            with db.begin_nested():
+                db.execute(insert(CrawlRun).values(**run))
+                db.execute(insert(CrawlJob).values(**job))
+        except IntegrityError as exc:
+            if is_active_job_conflict(exc):
+                lost.append(job["keyword_id"])
+            continue
+        inserted.append(job)
+    return inserted, lost
+
+
+def is_active_job_conflict(exc: IntegrityError) -> bool:
+    diag = getattr(exc.orig, "diag", None)
+    if diag is not None:
+        # psycopg2 reports the violated constraint (or unique index) by name.
+        return getattr(diag, "constraint_name", None) == ACTIVE_JOB_INDEX
+    message = str(exc.orig)
+    return "UNIQUE" in message and "crawl_jobs.keyword_id" in message
+
+
+def claim(db: Session, worker_id: str, limit: int, lease_seconds: float, max_attempts: int) -> List[ClaimedJob]:
+    # Due queued jobs, plus running jobs whose worker stopped renewing its lease. SKIP LOCKED lets
+    # any number of workers poll concurrently without handing the same job to two of them.
+    if limit <= 0:
+        return []
+    now = datetime.utcnow()
+    candidates = (
+        db.execute(
+            select(CrawlJob)
+            .where(
+                or_(
+                    and_(CrawlJob.status == "queued", CrawlJob.run_after <= now),
+                    and_(CrawlJob.status == "running", CrawlJob.lease_expires_at < now),
+                )
+            )
+            .order_by(CrawlJob.run_after, CrawlJob.created_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        .scalars()
+        .all()
+    )
+
+    claimed: List[ClaimedJob] = []
+    for job in candidates:
+        if job.status == "running" and job.attempts >= max_attempts:
+            _finish(db, job, "failed", f"lease expired after {job.attempts} attempts", now)
+            continue
+        # Compare-and-set on top of the row lock, so a backend without SKIP LOCKED (SQLite)
+        # still never hands one job to two workers.
+        result = db.execute(
+            update(CrawlJob)
+            .where(CrawlJob.id == job.id, CrawlJob.status == job.status, CrawlJob.attempts == job.attempts)
+            .values(
+                status="running",
+                worker_id=worker_id,
+                attempts=job.attempts + 1,
+                started_at=now,
+                lease_expires_at=now + timedelta(seconds=lease_seconds),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 1:
+            claimed.append(ClaimedJob(job.id, job.keyword_id, job.crawl_run_id, job.use_cache, job.attempts + 1))
+    db.commit()
+    return claimed
+
+
+def hold_lease(db: Session, lease: Lease) -> None:
+    # Locks the job row until the caller's transaction ends, so it cannot be reclaimed halfway
+    # through a write. A worker whose job was reclaimed (or failed) writes nothing.
+    held = db.execute(select(CrawlJob.id).where(*_leased(lease)).with_for_update()).first()
+    if held is None:
+        db.rollback()
+        raise LeaseLost(f"crawl job {lease.job_id} is no longer leased to {lease.worker_id}")
+
+
+def renew_lease(db: Session, lease: Lease, lease_seconds: float) -> bool:
+    result = db.execute(
+        update(CrawlJob)
+        .where(*_leased(lease))
+        .values(lease_expires_at=datetime.utcnow() + timedelta(seconds=lease_seconds))
+    )
+    db.commit()
+    return result.rowcount == 1
+
+
+def finish(db: Session, lease: Lease, status: str, error: Optional[str] = None) -> None:
+    job = db.execute(select(CrawlJob).where(*_leased(lease)).with_for_update()).scalars().first()
+    if job is None:
+        db.rollback()
+        return
+    _finish(db, job, status, error, datetime.utcnow())
+    db.commit()
+
+
+def _leased(lease: Lease) -> tuple:
+    return (
+        CrawlJob.id == lease.job_id,
+        CrawlJob.worker_id == lease.worker_id,
+        CrawlJob.attempts == lease.attempts,
+        CrawlJob.status == "running",
+    )
+
+
+def _finish(db: Session, job: CrawlJob, status: str, error: Optional[str], now: datetime) -> None:
+    job.status = status
+    job.error = error
+    job.finished_at = now
+    job.lease_expires_at = None
+    if status == "failed":
+        # Make sure the run does not stay pending/running forever when the crawl never got to record it.
+        db.execute(
+            update(CrawlRun)
+            .where(CrawlRun.id == job.crawl_run_id, CrawlRun.status.in_(("pending", "running")))
+            .values(status="failure", completed_at=now, notes=error)
+        )
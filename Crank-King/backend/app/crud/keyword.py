@@ -33,6 +33,7 @@ def create(db: Session, owner_id, obj_in: KeywordCreate) -> Keyword:
         target_names=obj_in.target_names,
         target_domains=obj_in.target_domains,
         status=obj_in.status,
+        crawl_depth=obj_in.crawl_depth,
         notes=obj_in.notes,
     )
     db.add(keyword)
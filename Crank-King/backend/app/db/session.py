@@ -1,7 +1,54 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, TypeVar
+
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
 
-engine = create_engine(settings.database_url, pool_pre_ping=True)
+T = TypeVar("T")
+
+_engine_options = {"pool_pre_ping": True}
+if not settings.database_url.startswith("sqlite"):
+    _engine_options["pool_size"] = settings.database_pool_size
+
+engine = create_engine(settings.database_url, **_engine_options)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# One worker per pooled connection, so an offloaded call never queues for a connection
+# while holding a thread.
+db_executor = ThreadPoolExecutor(max_workers=max(settings.database_pool_size, 1), thread_name_prefix="db")
+
+
+async def run_in_db(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    # Runs blocking Session work off the event loop. A Session is not thread-safe, so
+    # callers must await each call before issuing the next one on the same session.
+    # A cancelled caller still waits for the thread, which cannot be interrupted, to let go of
+    # the session: only then may the session be closed or reused. The cancellation is re-raised.
+    loop = asyncio.get_running_loop()
+    future = loop.run_in_executor(db_executor, partial(func, *args, **kwargs))
+    try:
+        return await asyncio.shield(future)
+    except asyncio.CancelledError:
+        while not future.done():
+            try:
+                await asyncio.wait((future,))
+            except asyncio.CancelledError:
+                pass
+        if not future.cancelled():
+            future.exception()
+        raise
+
+
+async def run_in_session(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    # Like run_in_db, but ``func(db, ...)`` gets a short-lived session of its own.
+    def call() -> T:
+        db = SessionLocal()
+        try:
+            return func(db, *args, **kwargs)
+        finally:
+            db.close()
+
+    return await run_in_db(call)
@@ -1,19 +1,40 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.v1 import api_router
 from app.core.config import settings
+from app.crawlers.cache import serp_cache
 from app.db.base_class import Base
 from app.db.session import engine
 from app import models  # noqa: F401
+from app.services.http_clients import http_clients
+from app.services.https_cache import https_check_cache
 from app.services.scheduler import start_scheduler, stop_scheduler
+from app.services.worker import CrawlWorker
 
 
 def init_db() -> None:
     Base.metadata.create_all(bind=engine)
 
 
-app = FastAPI(title=settings.project_name)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    init_db()
+    http_clients.start()
+    start_scheduler()
+    worker = CrawlWorker() if settings.crawler_embedded_worker else None
+    if worker is not None:
+        worker.start()
+    yield
+    stop_scheduler()
+    if worker is not None:
+        await worker.stop()
+    await http_clients.stop()
+
+
+app = FastAPI(title=settings.project_name, lifespan=lifespan)
 
 if settings.backend_cors_origins:
     app.add_middleware(
@@ -25,20 +46,16 @@ if settings.backend_cors_origins:
     )
 
 
-@app.on_event("startup")
-def on_startup() -> None:
-    init_db()
-    start_scheduler()
-
-
 @app.get("/health")
-def health_check() -> dict[str, str]:
-    return {"status": "ok"}
+def health_check() -> dict:
+    # Cache hit/miss counters of this process, so cache effectiveness can be watched.
+    return {
+        "status": "ok",
+        "caches": {
+            "serp": serp_cache.stats() if serp_cache is not None else None,
+            "https_checks": https_check_cache.stats(),
+        },
+    }
 
 
 app.include_router(api_router, prefix=settings.api_v1_prefix)
-
-
-@app.on_event("shutdown")
-def on_shutdown() -> None:
-    stop_scheduler()
@@ -1,4 +1,4 @@
 from app.db.base_class import Base  # noqa
 from .user import User  # noqa
 from .keyword import Keyword  # noqa
-from .crawl import CrawlRun, SerpEntry, HttpCheck  # noqa
+from .crawl import CrawlRun, SerpEntry, HttpCheck, CrawlJob, CrawlBatch, CrawlBatchItem  # noqa
@@ -1,7 +1,7 @@
 from datetime import datetime
 from uuid import uuid4
 
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, Integer, String, Text, text
 try:
     from sqlalchemy.dialects.postgresql import JSONB
 except ImportError:  # pragma: no cover
@@ -14,6 +14,7 @@ from app.db.base_class import BaseModel
 
 class CrawlRun(BaseModel):
     __tablename__ = "crawl_runs"
+    __table_args__ = (Index("ix_crawl_runs_keyword_status_started", "keyword_id", "status", "started_at"),)
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
     keyword_id = Column(UUID(as_uuid=True), ForeignKey("keywords.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -55,6 +56,69 @@ class HttpCheck(BaseModel):
     status_code = Column(Integer, nullable=True)
     ssl_valid = Column(Boolean, nullable=True)
     ssl_error = Column(Text, nullable=True)
+    error_category = Column(String, nullable=True)
+    cert_expires_at = Column(DateTime, nullable=True)
+    from_cache = Column(Boolean, nullable=False, default=False)
     checked_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
     crawl_run = relationship("CrawlRun", back_populates="http_checks")
+
+
+ACTIVE_JOB_STATUSES = ("queued", "running")
+ACTIVE_JOB_INDEX = "uq_crawl_jobs_active_keyword"
+
+
+class CrawlJob(BaseModel):
+    __tablename__ = "crawl_jobs"
+    __table_args__ = (
+        Index("ix_crawl_jobs_status_run_after", "status", "run_after"),
+        # At most one queued/running job per keyword: concurrent enqueues coalesce onto it.
+        Index(
+            ACTIVE_JOB_INDEX,
+            "keyword_id",
+            unique=True,
+            postgresql_where=text("status IN ('queued', 'running')"),
+            sqlite_where=text("status IN ('queued', 'running')"),
+        ),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    keyword_id = Column(UUID(as_uuid=True), ForeignKey("keywords.id", ondelete="CASCADE"), nullable=False, index=True)
+    crawl_run_id = Column(UUID(as_uuid=True), ForeignKey("crawl_runs.id", ondelete="CASCADE"), nullable=False)
+    status = Column(String, nullable=False, default="queued")
+    source = Column(String, nullable=False, default="api")
+    use_cache = Column(Boolean, nullable=False, default=True)
+    run_after = Column(DateTime, default=datetime.utcnow, nullable=False)
+    attempts = Column(Integer, nullable=False, default=0)
+    worker_id = Column(String, nullable=True)
+    lease_expires_at = Column(DateTime, nullable=True)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    crawl_run = relationship("CrawlRun")
+
+
+class CrawlBatch(BaseModel):
+    __tablename__ = "crawl_batches"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    owner_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    filters = Column(JSONB, nullable=True)
+    use_cache = Column(Boolean, nullable=False, default=True)
+    total = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    items = relationship("CrawlBatchItem", cascade="all, delete-orphan", back_populates="batch")
+
+
+class CrawlBatchItem(BaseModel):
+    # One row per keyword: the run the batch created for it, or the one it was coalesced onto.
+    __tablename__ = "crawl_batch_items"
+
+    batch_id = Column(UUID(as_uuid=True), ForeignKey("crawl_batches.id", ondelete="CASCADE"), primary_key=True)
+    keyword_id = Column(UUID(as_uuid=True), ForeignKey("keywords.id", ondelete="CASCADE"), primary_key=True)
+    crawl_run_id = Column(UUID(as_uuid=True), ForeignKey("crawl_runs.id", ondelete="CASCADE"), nullable=False, index=True)
+
+    batch = relationship("CrawlBatch", back_populates="items")
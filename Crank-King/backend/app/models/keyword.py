@@ -1,7 +1,7 @@
 from datetime import datetime
 from uuid import uuid4
 
-from sqlalchemy import Column, DateTime, ForeignKey, String, Text
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Integer, String, Text
 try:
     from sqlalchemy.dialects.postgresql import JSONB
 except ImportError:  # pragma: no cover
@@ -22,6 +22,14 @@ class Keyword(BaseModel):
     target_names = Column(JSONB, nullable=True)
     target_domains = Column(JSONB, nullable=True)
     status = Column(String, nullable=False, default="active")
+    crawl_depth = Column(Integer, nullable=True)
+    volatility = Column(Float, nullable=True)
+    next_crawl_at = Column(DateTime, nullable=True, index=True)
+    # Latest successful run (by started_at), kept up to date when a run completes.
+    latest_run_id = Column(UUID(as_uuid=True), nullable=True)
+    latest_flag = Column(String, nullable=True)
+    latest_run_at = Column(DateTime, nullable=True)
+    latest_run_started_at = Column(DateTime, nullable=True)
     notes = Column(Text, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
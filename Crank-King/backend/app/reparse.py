@@ -0,0 +1,95 @@
+"""Re-parse archived SERP HTML into ``serp_entries``.
+
+The manifest is a CSV with a ``run_id,page,html_path`` header; relative paths are resolved
+against the manifest's directory. For every run listed, the entries of the listed pages are
+replaced by a fresh parse, matched against the run's keyword, and written with COPY::
+
+    python -m app.reparse archive/manifest.csv
+
+Each run is committed on its own. ``http_checks`` and the run's flag are left untouched.
+"""
+
+import argparse
+import csv
+import logging
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+from app.crawlers.naver import parse_serp
+from app.crud import bulk
+from app.db.session import SessionLocal
+from app.models.crawl import CrawlRun, SerpEntry
+from app.services.matcher import compile_matcher
+
+logger = logging.getLogger(__name__)
+
+
+def read_manifest(path: Path) -> Dict[UUID, List[Tuple[int, Path]]]:
+    runs: Dict[UUID, List[Tuple[int, Path]]] = defaultdict(list)
+    with path.open(newline="", encoding="utf-8") as handle:
+        for row in csv.DictReader(handle):
+            html_path = Path(row["html_path"])
+            if not html_path.is_absolute():
+                html_path = path.parent / html_path
+            runs[UUID(row["run_id"])].append((int(row["page"]), html_path))
+    return runs
+
+
+def reparse_run(db, run_id: UUID, pages: List[Tuple[int, Path]]) -> Optional[int]:
+    run = db.get(CrawlRun, run_id)
+    if run is None:
+        return None
+    keyword = run.keyword
+    matcher = compile_matcher(keyword)
+
+    def rows():
+        for page, html_path in pages:
+            parsed = parse_serp(html_path.read_text(encoding="utf-8"), keyword.query, page)
+            for entry in parsed.entries:
+                is_match, reason = matcher.match(entry)
+                yield bulk.serp_entry_row(run_id, entry, is_match, reason)
+
+    db.query(SerpEntry).filter(
+        SerpEntry.crawl_run_id == run_id, SerpEntry.page.in_([page for page, _ in pages])
+    ).delete(synchronize_session=False)
+    count = bulk.copy_serp_entries(db, rows())
+    db.commit()
+    return count
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("manifest", type=Path)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    runs = read_manifest(args.manifest)
+    failures = 0
+    total = 0
+    db = SessionLocal()
+    try:
+        for run_id, pages in runs.items():
+            try:
+                count = reparse_run(db, run_id, pages)
+            except Exception:
+                db.rollback()
+                failures += 1
+                logger.exception("Re-parse failed for run %s", run_id)
+                continue
+            if count is None:
+                failures += 1
+                logger.warning("Run %s not found", run_id)
+                continue
+            total += count
+    finally:
+        db.close()
+
+    logger.info("%d runs, %d entries written, %d failed", len(runs), total, failures)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,8 @@
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional
 from uuid import UUID
 
-from pydantic import BaseModel, HttpUrl
+from pydantic import BaseModel, Field, HttpUrl
 
 
 class SerpEntry(BaseModel):
@@ -26,6 +26,9 @@ class HttpCheck(BaseModel):
     status_code: Optional[int]
     ssl_valid: Optional[bool]
     ssl_error: Optional[str]
+    error_category: Optional[str] = None
+    cert_expires_at: Optional[datetime] = None
+    from_cache: bool = False
     checked_at: datetime
 
     class Config:
@@ -46,3 +49,41 @@ class CrawlRun(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class CrawlBatchCreate(BaseModel):
+    # Either explicit keyword ids or filters over the caller's keywords (both narrow the selection).
+    # Without keyword ids, ``status`` defaults to active.
+    keyword_ids: Optional[List[UUID]] = Field(default=None, min_length=1)
+    category: Optional[str] = None
+    status: Optional[str] = None
+    refresh: bool = False
+
+
+class CrawlBatch(BaseModel):
+    id: UUID
+    created_at: datetime
+    filters: Optional[dict]
+    use_cache: bool
+    total: int
+    pending: int = 0
+    running: int = 0
+    success: int = 0
+    failure: int = 0
+    flags: Dict[str, int] = {}
+    completed: bool = False
+
+    class Config:
+        from_attributes = True
+
+
+class CrawlBatchResult(BaseModel):
+    keyword_id: UUID
+    query: str
+    crawl_run_id: UUID
+    status: str
+    flag: Optional[str]
+    started_at: datetime
+    completed_at: Optional[datetime]
+    https_issues: Optional[dict]
+    notes: Optional[str]
@@ -13,6 +13,7 @@ class KeywordBase(BaseModel):
     target_names: List[str] = []
     target_domains: List[str] = []
     status: Optional[str] = "active"
+    crawl_depth: Optional[int] = Field(default=None, ge=1, le=5)
     notes: Optional[str] = None
 
 
@@ -25,12 +26,15 @@ class KeywordUpdate(BaseModel):
     target_names: Optional[List[str]] = None
     target_domains: Optional[List[str]] = None
     status: Optional[str] = None
+    crawl_depth: Optional[int] = Field(default=None, ge=1, le=5)
     notes: Optional[str] = None
 
 
 class KeywordRead(KeywordBase):
     id: UUID
     owner_id: UUID
+    volatility: Optional[float] = None
+    next_crawl_at: Optional[datetime] = None
     created_at: datetime
     updated_at: datetime
 
@@ -39,6 +43,7 @@ class KeywordRead(KeywordBase):
 
 
 class KeywordSummary(KeywordRead):
+    latest_run_id: Optional[UUID] = None
     latest_flag: Optional[str] = None
     latest_run_at: Optional[datetime] = None
 
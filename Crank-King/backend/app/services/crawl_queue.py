@@ -0,0 +1,62 @@
+import asyncio
+import time
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.crud import crawl as crud_crawl
+from app.crud import job as crud_job
+from app.db.session import run_in_session
+from app.models.crawl import CrawlRun
+from app.schemas.crawl import CrawlRun as CrawlRunSchema
+
+TERMINAL_RUN_STATUSES = ("success", "failure")
+
+
+async def enqueue_crawl(
+    keyword_id: UUID, use_cache: bool = True, source: str = "api"
+) -> Optional[crud_job.EnqueuedCrawl]:
+    # Joins the keyword's queued/running crawl if there is one, or reuses a success younger than
+    # ``crawler_crawl_freshness_seconds``; a refresh (``use_cache=False``) skips only the latter.
+    fresh_seconds = settings.crawler_crawl_freshness_seconds if use_cache else None
+    crawls = await run_in_session(crud_job.enqueue, [(keyword_id, None)], source, use_cache, fresh_seconds)
+    # Empty when the keyword could not be queued, e.g. it was deleted meanwhile.
+    return crawls[0] if crawls else None
+
+
+async def wait_for_run(run_id: UUID, timeout: float, interval: float = 0.5) -> Optional[CrawlRunSchema]:
+    # Polls only the status column until the run finishes or ``timeout`` passes, then loads it once.
+    deadline = time.monotonic() + timeout
+    while True:
+        status = await run_in_session(run_status, run_id)
+        if status is None:
+            return None
+        if status in TERMINAL_RUN_STATUSES or time.monotonic() >= deadline:
+            return await run_in_session(load_run, run_id)
+        await asyncio.sleep(min(interval, max(deadline - time.monotonic(), 0.0)))
+
+
+def pending_run(job: crud_job.EnqueuedCrawl) -> CrawlRunSchema:
+    # The run as enqueue() created it, without a round trip.
+    return CrawlRunSchema(
+        id=job.crawl_run_id,
+        keyword_id=job.keyword_id,
+        started_at=job.created_at,
+        completed_at=None,
+        status="pending",
+        flag=None,
+        notes=None,
+        https_issues=None,
+    )
+
+
+def load_run(db: Session, run_id: UUID) -> Optional[CrawlRunSchema]:
+    run = crud_crawl.get_run(db, run_id)
+    return CrawlRunSchema.model_validate(run) if run is not None else None
+
+
+def run_status(db: Session, run_id: UUID) -> Optional[str]:
+    return db.query(CrawlRun.status).filter(CrawlRun.id == run_id).scalar()
+
@@ -1,105 +1,81 @@
 import asyncio
-from typing import Iterable, List, Tuple
+from typing import Iterable, List, Optional, Tuple
 from urllib.parse import urlparse
+from uuid import UUID
 
 import httpx
 from sqlalchemy.orm import Session
 
-from app.core.config import settings
 from app.crawlers.naver import SerpEntryData, crawl_keyword
-from app.crud import crawl as crud_crawl
-from app.models.crawl import CrawlRun, HttpCheck, SerpEntry
+from app.crud.job import Lease, LeaseLost
+from app.models.crawl import HttpCheck
 from app.models.keyword import Keyword
-
-
-def normalize_text(value: str) -> str:
-    return "".join(value.lower().split())
+from app.schemas.crawl import CrawlRun as CrawlRunSchema
+from app.services.http_clients import http_clients
+from app.services.https_check import check_https
+from app.services.https_cache import https_check_cache
+from app.services.matcher import compile_matcher, normalize_text  # noqa: F401
+from app.services.rate_limiter import host_limiter, https_check_slots
+from app.services.run_writer import CrawlRunWriter
 
 
 def entry_matches(entry: SerpEntryData, keyword: Keyword) -> Tuple[bool, str | None]:
-    target_names = keyword.target_names or []
-    target_domains = keyword.target_domains or []
-
-    normalized_title = normalize_text(entry.title)
-
-    name_candidates = [keyword.query, *target_names]
-    for candidate in name_candidates:
-        cand = normalize_text(candidate)
-        if cand and cand in normalized_title:
-            return True, f"matched name '{candidate}'"
-
-    domain_candidates = [*target_domains]
-    parsed_display = urlparse(entry.display_url if "://" in entry.display_url else f"http://{entry.display_url}")
-    display_host = parsed_display.netloc.lower()
-    landing_host = urlparse(entry.landing_url).netloc.lower()
-    for candidate in domain_candidates:
-        if not candidate:
-            continue
-        needle = candidate.lower()
-        if needle in display_host or needle in landing_host:
-            return True, f"matched domain '{candidate}'"
-
-    return False, None
-
-
-async def check_https(client: httpx.AsyncClient, url: str) -> HttpCheck:
-    parsed = urlparse(url)
-    protocol = parsed.scheme or "http"
-    if protocol != "https":
-        return HttpCheck(url=url, protocol=protocol or "http", ssl_valid=False, ssl_error="Non-HTTPS URL")
-
+    return compile_matcher(keyword).match(entry)
+
+
+async def verify_url(client: httpx.AsyncClient, url: str, use_cache: bool = True) -> HttpCheck:
+    cached = https_check_cache.get(url) if use_cache else None
+    if cached is not None:
+        return https_check_cache.to_check(url, cached)
+    # Per-host slot first so a busy host never holds one of the global slots while waiting.
+    async with host_limiter.slot(urlparse(url).netloc), https_check_slots:
+        check = await check_https(client, url)
+    if check.protocol == "https":
+        https_check_cache.store(check)
+    return check
+
+
+async def execute_crawl(
+    db: Session,
+    keyword: Keyword,
+    client: Optional[httpx.AsyncClient] = None,
+    use_cache: bool = True,
+    run_id: Optional[UUID] = None,
+    lease: Optional[Lease] = None,
+) -> CrawlRunSchema:
+    client = client or http_clients.client
+    # Everything needed from the keyword is read before the first commit expires it, so
+    # nothing lazy-loads on the event loop afterwards.
+    query, depth = keyword.query, keyword.crawl_depth
+    matcher = compile_matcher(keyword)
+    writer = CrawlRunWriter(db, keyword.id, run_id=run_id, lease=lease)
+    await writer.start()
     try:
-        response = await client.get(url, timeout=15.0, follow_redirects=True)
-        response.raise_for_status()
-    except httpx.HTTPError as exc:
-        return HttpCheck(url=url, protocol=protocol, ssl_valid=False, ssl_error=str(exc))
-    return HttpCheck(url=url, protocol=protocol, ssl_valid=True, status_code=response.status_code)
-
-
-async def execute_crawl(db: Session, keyword: Keyword) -> CrawlRun:
-    run = crud_crawl.create_run(db, keyword_id=keyword.id)
-    try:
-        pages = await crawl_keyword(keyword.query)
-        serp_objects: List[SerpEntry] = []
+        pages = await crawl_keyword(query, client, use_cache=use_cache, depth=depth)
         matched_urls: List[str] = []
 
         for page in pages:
             for entry in page.entries:
-                is_match, reason = entry_matches(entry, keyword)
-                serp_objects.append(
-                    SerpEntry(
-                        crawl_run_id=run.id,
-                        page=entry.page,
-                        rank=entry.rank,
-                        title=entry.title,
-                        display_url=entry.display_url,
-                        landing_url=entry.landing_url,
-                        is_match=is_match,
-                        match_reason=reason,
-                    )
-                )
+                is_match, reason = matcher.match(entry)
+                writer.add_entry(entry, is_match, reason)
                 if is_match and entry.landing_url not in matched_urls:
                     matched_urls.append(entry.landing_url)
 
-        crud_crawl.add_serp_entries(db, run, serp_objects)
-
         checks: List[HttpCheck] = []
         if matched_urls:
-            headers = {"User-Agent": settings.crawler_user_agent}
-            async with httpx.AsyncClient(headers=headers) as client:
-                for url in matched_urls:
-                    await asyncio.sleep(settings.crawler_delay_seconds)
-                    checks.append(await check_https(client, url))
-            crud_crawl.add_http_checks(db, run, checks)
+            checks = list(await asyncio.gather(*(verify_url(client, url, use_cache=use_cache) for url in matched_urls)))
+            writer.add_checks(checks)
 
         flag = determine_flag(matched_urls, checks)
         https_issues = {
             check.url: check.ssl_error for check in checks if check.ssl_valid is False and check.ssl_error
         }
-        crud_crawl.mark_run_complete(db, run, flag=flag, https_issues=https_issues or None)
-        return crud_crawl.get_run(db, run.id)
+        return await writer.complete(flag=flag, https_issues=https_issues or None)
+    except LeaseLost:
+        # Another worker owns the job now; recording a failure would overwrite its run.
+        raise
     except Exception as exc:  # pragma: no cover - guard rail
-        crud_crawl.mark_run_failed(db, run, message=str(exc))
+        await writer.fail(message=str(exc))
         raise
 
 
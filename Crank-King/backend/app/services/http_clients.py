@@ -0,0 +1,47 @@
+from typing import Optional
+
+import httpx
+
+try:
+    import h2  # noqa: F401
+except ImportError:  # pragma: no cover
+    h2 = None
+
+from app.core.config import settings
+
+
+def build_http_client() -> httpx.AsyncClient:
+    limits = httpx.Limits(
+        max_connections=settings.crawler_pool_size,
+        max_keepalive_connections=settings.crawler_keepalive_connections,
+        keepalive_expiry=settings.crawler_keepalive_expiry,
+    )
+    return httpx.AsyncClient(
+        headers={"User-Agent": settings.crawler_user_agent},
+        limits=limits,
+        http2=settings.crawler_http2 and h2 is not None,
+    )
+
+
+class HttpClientManager:
+    # One pooled client per process, shared by SERP fetches and HTTPS checks so that
+    # keep-alive (and HTTP/2 multiplexing toward Naver) survives across keywords and runs.
+    def __init__(self) -> None:
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def start(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = build_http_client()
+        return self._client
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        return self.start()
+
+    async def stop(self) -> None:
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+
+
+http_clients = HttpClientManager()
@@ -0,0 +1,127 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Optional, Set
+from urllib.parse import urlparse
+
+from app.core.config import settings
+from app.models.crawl import HttpCheck
+
+
+@dataclass
+class CachedCheck:
+    protocol: str
+    status_code: Optional[int]
+    ssl_valid: Optional[bool]
+    ssl_error: Optional[str]
+    cert_expires_at: Optional[datetime]
+    checked_at: datetime
+    expires_at: float
+
+
+class HttpsCheckCache:
+    # Process-wide, so it is shared by every keyword of a batch and by later runs.
+    # Only passing checks are cached, per URL, and a URL entry is trusted only while its
+    # host also has a live entry: any failing check on a host drops the host and all of its URLs.
+    # With ``host_scoped`` (the ``tls`` check mode, whose result depends on the host alone) there
+    # is one entry per host and it answers for every URL on that host.
+
+    def __init__(self, ttl_seconds: float, max_entries: int, host_scoped: bool = False) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.host_scoped = host_scoped
+        self.hits = 0
+        self.misses = 0
+        self._urls: "OrderedDict[str, CachedCheck]" = OrderedDict()
+        self._hosts: Dict[str, float] = {}
+        self._host_urls: Dict[str, Set[str]] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_entries > 0
+
+    def get(self, url: str) -> Optional[CachedCheck]:
+        if not self.enabled:
+            return None
+        now = time.monotonic()
+        key = self._key(url)
+        entry = self._urls.get(key)
+        host = _host(url)
+        if entry is None or entry.expires_at <= now or self._hosts.get(host, 0.0) <= now:
+            if entry is not None:
+                self._drop_url(key)
+            self.misses += 1
+            return None
+        self._urls.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def store(self, check: HttpCheck) -> None:
+        if not self.enabled:
+            return
+        host = _host(check.url)
+        if check.ssl_valid is not True:
+            self.invalidate_host(host)
+            return
+        ttl = self.ttl_seconds
+        if check.cert_expires_at is not None:
+            ttl = min(ttl, (check.cert_expires_at - datetime.utcnow()).total_seconds())
+        if ttl <= 0:
+            return
+        expires_at = time.monotonic() + ttl
+        key = self._key(check.url)
+        self._urls[key] = CachedCheck(
+            protocol=check.protocol,
+            status_code=check.status_code,
+            ssl_valid=check.ssl_valid,
+            ssl_error=check.ssl_error,
+            cert_expires_at=check.cert_expires_at,
+            checked_at=check.checked_at or datetime.utcnow(),
+            expires_at=expires_at,
+        )
+        self._urls.move_to_end(key)
+        self._hosts[host] = expires_at
+        self._host_urls.setdefault(host, set()).add(key)
+        while len(self._urls) > self.max_entries:
+            self._drop_url(next(iter(self._urls)))
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._urls)}
+
+    def invalidate_host(self, host: str) -> None:
+        self._hosts.pop(host, None)
+        for url in self._host_urls.pop(host, set()):
+            self._urls.pop(url, None)
+
+    def _key(self, url: str) -> str:
+        return f"https://{_host(url)}/" if self.host_scoped else url
+
+    def _drop_url(self, url: str) -> None:
+        self._urls.pop(url, None)
+        urls = self._host_urls.get(_host(url))
+        if urls is not None:
+            urls.discard(url)
+
+    def to_check(self, url: str, entry: CachedCheck) -> HttpCheck:
+        return HttpCheck(
+            url=url,
+            protocol=entry.protocol,
+            status_code=entry.status_code,
+            ssl_valid=entry.ssl_valid,
+            ssl_error=entry.ssl_error,
+            cert_expires_at=entry.cert_expires_at,
+            checked_at=entry.checked_at,
+            from_cache=True,
+        )
+
+
+def _host(url: str) -> str:
+    return urlparse(url).netloc.lower()
+
+
+https_check_cache = HttpsCheckCache(
+    settings.crawler_https_cache_ttl_seconds,
+    settings.crawler_https_cache_max_entries,
+    host_scoped=settings.crawler_https_check_mode == "tls",
+)
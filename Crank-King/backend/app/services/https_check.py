@@ -0,0 +1,124 @@
+import asyncio
+import ssl
+from datetime import datetime
+from typing import Optional, Tuple
+from urllib.parse import urlparse
+
+import httpx
+
+from app.core.config import settings
+from app.models.crawl import HttpCheck
+
+CHECK_TIMEOUT = 15.0
+
+# OpenSSL X509_V_ERR_* codes carried by ssl.SSLCertVerificationError.verify_code
+_VERIFY_CODE_CATEGORIES = {
+    9: "cert_not_yet_valid",
+    10: "cert_expired",
+    18: "self_signed",
+    19: "self_signed",
+    20: "untrusted_issuer",
+    21: "untrusted_issuer",
+    62: "hostname_mismatch",
+}
+
+
+async def check_https(client: httpx.AsyncClient, url: str, mode: Optional[str] = None) -> HttpCheck:
+    parsed = urlparse(url)
+    protocol = parsed.scheme or "http"
+    if protocol != "https":
+        return HttpCheck(
+            url=url, protocol=protocol or "http", ssl_valid=False, ssl_error="Non-HTTPS URL", error_category="non_https"
+        )
+
+    mode = mode or settings.crawler_https_check_mode
+    try:
+        if mode == "tls":
+            status_code, expires_at = None, await _tls_handshake(parsed.hostname or "", parsed.port or 443)
+        elif mode == "head":
+            status_code, expires_at = await _head_request(client, url)
+        else:
+            status_code, expires_at = await _headers_only_get(client, url)
+    except (httpx.HTTPError, OSError, asyncio.TimeoutError) as exc:
+        return HttpCheck(
+            url=url,
+            protocol=protocol,
+            ssl_valid=False,
+            ssl_error=str(exc) or exc.__class__.__name__,
+            error_category=categorize_error(exc),
+            status_code=exc.response.status_code if isinstance(exc, httpx.HTTPStatusError) else None,
+        )
+    return HttpCheck(url=url, protocol=protocol, ssl_valid=True, status_code=status_code, cert_expires_at=expires_at)
+
+
+def categorize_error(exc: BaseException) -> str:
+    if isinstance(exc, httpx.HTTPStatusError):
+        return "http_status"
+    cause: Optional[BaseException] = exc
+    while cause is not None:
+        if isinstance(cause, ssl.SSLCertVerificationError):
+            category = _VERIFY_CODE_CATEGORIES.get(cause.verify_code)
+            if category:
+                return category
+            message = (cause.verify_message or "").lower()
+            if "expired" in message:
+                return "cert_expired"
+            if "hostname" in message:
+                return "hostname_mismatch"
+            if "self-signed" in message or "self signed" in message:
+                return "self_signed"
+            return "cert_invalid"
+        if isinstance(cause, ssl.SSLError):
+            return "tls_error"
+        cause = cause.__cause__ or cause.__context__
+    if isinstance(exc, (httpx.TimeoutException, asyncio.TimeoutError)):
+        return "timeout"
+    if isinstance(exc, httpx.TooManyRedirects):
+        return "redirect_loop"
+    if isinstance(exc, (httpx.TransportError, OSError)):
+        return "connection_error"
+    return "http_error"
+
+
+async def _headers_only_get(client: httpx.AsyncClient, url: str) -> Tuple[int, Optional[datetime]]:
+    # Same status/redirect handling as a full GET, but the body is never read.
+    async with client.stream("GET", url, timeout=CHECK_TIMEOUT, follow_redirects=True) as response:
+        expires_at = _peer_cert_expiry(response)
+        response.raise_for_status()
+        return response.status_code, expires_at
+
+
+async def _head_request(client: httpx.AsyncClient, url: str) -> Tuple[int, Optional[datetime]]:
+    # Plenty of sites reject HEAD; any error status is confirmed with a headers-only GET.
+    async with client.stream("HEAD", url, timeout=CHECK_TIMEOUT, follow_redirects=True) as response:
+        if response.status_code < 400:
+            return response.status_code, _peer_cert_expiry(response)
+    return await _headers_only_get(client, url)
+
+
+async def _tls_handshake(host: str, port: int) -> Optional[datetime]:
+    context = ssl.create_default_context()
+    _, writer = await asyncio.wait_for(
+        asyncio.open_connection(host, port, ssl=context, server_hostname=host), timeout=CHECK_TIMEOUT
+    )
+    try:
+        ssl_object = writer.get_extra_info("ssl_object")
+        return _cert_expiry(ssl_object.getpeercert() if ssl_object else None)
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except (OSError, ssl.SSLError):
+            pass
+
+
+def _peer_cert_expiry(response: httpx.Response) -> Optional[datetime]:
+    stream = response.extensions.get("network_stream")
+    ssl_object = stream.get_extra_info("ssl_object") if stream is not None else None
+    return _cert_expiry(ssl_object.getpeercert() if ssl_object else None)
+
+
+def _cert_expiry(cert: Optional[dict]) -> Optional[datetime]:
+    if not cert or "notAfter" not in cert:
+        return None
+    return datetime.utcfromtimestamp(ssl.cert_time_to_seconds(cert["notAfter"]))
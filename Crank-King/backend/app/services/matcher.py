@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+from collections import deque
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+
+from app.crawlers.naver import SerpEntryData
+
+# Below this many patterns plain ``in`` checks (done in C) beat walking an automaton in Python.
+AUTOMATON_MIN_PATTERNS = 8
+
+
+def normalize_text(value: str) -> str:
+    return "".join(value.lower().split())
+
+
+class PatternSet:
+    # Finds the lowest-indexed pattern occurring in a text, i.e. the same pattern a loop of
+    # ``pattern in text`` checks in list order would stop at. Large sets use Aho-Corasick.
+
+    def __init__(self, patterns: Sequence[str]) -> None:
+        self.patterns = list(patterns)
+        self._goto: List[Dict[str, int]] = []
+        self._fail: List[int] = []
+        self._best: List[Optional[int]] = []
+        if len(self.patterns) >= AUTOMATON_MIN_PATTERNS:
+            self._build()
+
+    def _build(self) -> None:
+        goto: List[Dict[str, int]] = [{}]
+        best: List[Optional[int]] = [None]
+        for index, pattern in enumerate(self.patterns):
+            node = 0
+            for char in pattern:
+                nxt = goto[node].get(char)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[node][char] = nxt
+                    goto.append({})
+                    best.append(None)
+                node = nxt
+            if best[node] is None:
+                best[node] = index
+
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in goto[node].items():
+                queue.append(child)
+                state = fail[node]
+                while state and char not in goto[state]:
+                    state = fail[state]
+                fail[child] = goto[state].get(char, 0)
+                inherited = best[fail[child]]
+                if inherited is not None and (best[child] is None or inherited < best[child]):
+                    best[child] = inherited
+
+        self._goto = goto
+        self._best = best
+        self._fail = fail
+
+    def first_match(self, *texts: str) -> Optional[int]:
+        if not self._goto:
+            for index, pattern in enumerate(self.patterns):
+                if any(pattern in text for text in texts):
+                    return index
+            return None
+
+        goto, fail, best = self._goto, self._fail, self._best
+        # An empty pattern ends at the root, which the walk below never reports.
+        found: Optional[int] = best[0] if texts else None
+        if found == 0:
+            return 0
+        for text in texts:
+            node = 0
+            for char in text:
+                while node and char not in goto[node]:
+                    node = fail[node]
+                node = goto[node].get(char, 0)
+                hit = best[node]
+                if hit is not None and (found is None or hit < found):
+                    found = hit
+                    if found == 0:
+                        return 0
+        return found
+
+
+class KeywordMatcher:
+    def __init__(self, query: str, target_names: Sequence[str], target_domains: Sequence[str]) -> None:
+        names: List[Tuple[str, str]] = []
+        for candidate in [query, *target_names]:
+            normalized = normalize_text(candidate)
+            if normalized:
+                names.append((candidate, normalized))
+        domains = [(candidate, candidate.lower()) for candidate in target_domains if candidate]
+
+        self._names = [candidate for candidate, _ in names]
+        self._name_patterns = PatternSet([normalized for _, normalized in names])
+        self._domains = [candidate for candidate, _ in domains]
+        self._domain_patterns = PatternSet([needle for _, needle in domains])
+
+    def match(self, entry: SerpEntryData) -> Tuple[bool, str | None]:
+        if self._names:
+            index = self._name_patterns.first_match(normalize_text(entry.title))
+            if index is not None:
+                return True, f"matched name '{self._names[index]}'"
+
+        if self._domains:
+            index = self._domain_patterns.first_match(display_host(entry.display_url), landing_host(entry.landing_url))
+            if index is not None:
+                return True, f"matched domain '{self._domains[index]}'"
+
+        return False, None
+
+
+@lru_cache(maxsize=8192)
+def display_host(display_url: str) -> str:
+    return urlparse(display_url if "://" in display_url else f"http://{display_url}").netloc.lower()
+
+
+@lru_cache(maxsize=8192)
+def landing_host(landing_url: str) -> str:
+    return urlparse(landing_url).netloc.lower()
+
+
+@lru_cache(maxsize=1024)
+def _compile(query: str, target_names: Tuple[str, ...], target_domains: Tuple[str, ...]) -> KeywordMatcher:
+    return KeywordMatcher(query, target_names, target_domains)
+
+
+def compile_matcher(keyword) -> KeywordMatcher:
+    return _compile(keyword.query, tuple(keyword.target_names or ()), tuple(keyword.target_domains or ()))
@@ -0,0 +1,161 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
+
+from app.core.config import settings
+
+
+class TokenBucket:
+    # ``rate`` tokens per second, bursting up to ``capacity``; rate <= 0 disables limiting.
+    def __init__(self, rate: float, capacity: float = 1.0) -> None:
+        self.rate = rate
+        self.capacity = max(capacity, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class HostRateLimiter:
+    def __init__(self, rate: float, capacity: float = 1.0, max_in_flight: int = 1) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.max_in_flight = max(max_in_flight, 1)
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    def bucket(self, host: str) -> TokenBucket:
+        key = host.lower()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = TokenBucket(self.rate, self.capacity)
+            self._buckets[key] = bucket
+        return bucket
+
+    @asynccontextmanager
+    async def slot(self, host: str) -> AsyncIterator[None]:
+        key = host.lower()
+        semaphore = self._semaphores.get(key)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_in_flight)
+            self._semaphores[key] = semaphore
+        async with semaphore:
+            await self.bucket(key).acquire()
+            yield
+
+
+class AdaptiveSemaphore:
+    def __init__(self, limit: int) -> None:
+        self.limit = max(limit, 1)
+        self._active = 0
+        self._condition = asyncio.Condition()
+
+    async def set_limit(self, limit: int) -> None:
+        async with self._condition:
+            self.limit = max(limit, 1)
+            self._condition.notify_all()
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._active < self.limit)
+            self._active += 1
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self._active -= 1
+                self._condition.notify_all()
+
+
+class AdaptiveRateController:
+    # AIMD over the request rate and the number of in-flight requests: halve both on a
+    # 429/5xx, step back up after successes. A decrease happens at most once per congestion
+    # window: failures of requests sent before the last decrease belong to the same burst and
+    # do not halve again (nor count toward the breaker). Retry-After pauses every caller, and
+    # ``failure_threshold`` consecutive failures open the breaker for ``cooldown`` seconds;
+    # afterwards a single request probes the upstream before concurrency ramps up again.
+    def __init__(
+        self,
+        bucket: TokenBucket,
+        max_concurrency: int,
+        min_rate: float,
+        failure_threshold: int,
+        cooldown: float,
+    ) -> None:
+        self.bucket = bucket
+        self.max_rate = bucket.rate
+        self.min_rate = min_rate
+        self.max_concurrency = max(max_concurrency, 1)
+        self.failure_threshold = max(failure_threshold, 1)
+        self.cooldown = cooldown
+        self.slots = AdaptiveSemaphore(self.max_concurrency)
+        self._failures = 0
+        self._successes = 0
+        self._paused_until = 0.0
+        self._last_decrease = float("-inf")
+
+    @asynccontextmanager
+    async def request(self) -> AsyncIterator[float]:
+        # Yields the moment the request is sent, to hand back to on_failure().
+        async with self.slots.slot():
+            while (wait := self._paused_until - time.monotonic()) > 0:
+                await asyncio.sleep(wait)
+            await self.bucket.acquire()
+            yield time.monotonic()
+
+    async def on_success(self) -> None:
+        self._failures = 0
+        self._successes += 1
+        if self.max_rate > 0 and self.bucket.rate < self.max_rate:
+            self.bucket.rate = min(self.max_rate, self.bucket.rate + self.max_rate * 0.1)
+        if self.slots.limit < self.max_concurrency and self._successes >= self.slots.limit:
+            self._successes = 0
+            await self.slots.set_limit(self.slots.limit + 1)
+
+    async def on_failure(self, retry_after: Optional[float] = None, sent_at: Optional[float] = None) -> None:
+        now = time.monotonic()
+        if retry_after:
+            self._paused_until = max(self._paused_until, now + retry_after)
+        if sent_at is not None and sent_at <= self._last_decrease:
+            return
+        self._last_decrease = now
+        self._failures += 1
+        self._successes = 0
+        if self.max_rate > 0:
+            self.bucket.rate = max(self.min_rate, self.bucket.rate / 2)
+        limit = self.slots.limit // 2
+        if self._failures >= self.failure_threshold:
+            self._paused_until = max(self._paused_until, now + self.cooldown)
+            limit = 1
+        await self.slots.set_limit(limit)
+
+
+naver_limiter = TokenBucket(settings.naver_rate, settings.crawler_naver_burst)
+naver_controller = AdaptiveRateController(
+    naver_limiter,
+    max_concurrency=settings.crawler_naver_max_in_flight,
+    min_rate=settings.crawler_naver_min_rate,
+    failure_threshold=settings.crawler_breaker_threshold,
+    cooldown=settings.crawler_breaker_cooldown_seconds,
+)
+host_limiter = HostRateLimiter(
+    settings.crawler_host_rate, settings.crawler_host_burst, max_in_flight=settings.crawler_host_max_in_flight
+)
+https_check_slots = asyncio.Semaphore(max(settings.crawler_https_concurrency, 1))
@@ -0,0 +1,144 @@
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.crawlers.naver import resolve_crawl_depth
+from app.crud import job as crud_job
+from app.models.crawl import ACTIVE_JOB_STATUSES, CrawlJob, CrawlRun, SerpEntry
+from app.models.keyword import Keyword
+
+
+def enabled() -> bool:
+    # Volatility and next_crawl_at only drive the adaptive schedule; other modes skip their upkeep.
+    return settings.crawler_schedule_mode == "adaptive"
+
+
+def rank_change(previous: Dict[str, int], current: Dict[str, int]) -> float:
+    # 0 when the ranking is identical, 1 when no result kept its URL. Rank shifts are scaled by
+    # half the result count, so moving one place in a top-20 weighs 1/10 and a random reshuffle
+    # lands around 2/3.
+    urls = previous.keys() | current.keys()
+    if not urls:
+        return 0.0
+    half = max(len(previous), len(current), 2) / 2
+    total = 0.0
+    for url in urls:
+        before, after = previous.get(url), current.get(url)
+        total += 1.0 if before is None or after is None else min(abs(before - after) / half, 1.0)
+    return total / len(urls)
+
+
+def change_score(
+    previous: Dict[str, int], current: Dict[str, int], previous_flag: Optional[str], flag: Optional[str]
+) -> float:
+    # A flag change is what users act on, so it counts as a full change on its own.
+    if previous_flag != flag:
+        return 1.0
+    return rank_change(previous, current)
+
+
+def update_volatility(volatility: Optional[float], change: float) -> float:
+    if volatility is None:
+        return change
+    alpha = settings.crawler_volatility_alpha
+    return alpha * change + (1 - alpha) * volatility
+
+
+def recrawl_interval(volatility: Optional[float]) -> timedelta:
+    # Geometric between the bounds: volatility 0 waits the maximum, 1 the minimum.
+    low = max(settings.crawler_recrawl_min_hours, 0.1)
+    high = max(settings.crawler_recrawl_max_hours, low)
+    score = min(max(volatility if volatility is not None else 1.0, 0.0), 1.0)
+    return timedelta(hours=high * (low / high) ** score)
+
+
+def failure_backoff(failures: int) -> timedelta:
+    # Doubles from the minimum interval with every consecutive failure, capped at the maximum.
+    low = max(settings.crawler_recrawl_min_hours, 0.1)
+    high = max(settings.crawler_recrawl_max_hours, low)
+    return timedelta(hours=min(low * 2 ** min(max(failures - 1, 0), 32), high))
+
+
+def ranking(rows: Iterable[Tuple[str, int, int]]) -> Dict[str, int]:
+    # (landing_url, page, rank) -> landing_url: overall position; the first occurrence wins.
+    result: Dict[str, int] = {}
+    for position, (url, _, _) in enumerate(sorted(rows, key=lambda row: (row[1], row[2])), start=1):
+        result.setdefault(url, position)
+    return result
+
+
+def schedule_after_run(
+    db: Session, keyword_id: UUID, run_id: UUID, current: Dict[str, int], flag: str, completed_at: datetime
+) -> dict:
+    # New volatility and next_crawl_at for a keyword whose run just succeeded, compared with its
+    # previous successful run, which the keyword's latest-run summary still points at. Only reads;
+    # the caller writes the values with the run.
+    summary = (
+        db.query(Keyword.volatility, Keyword.latest_run_id, Keyword.latest_flag).filter(Keyword.id == keyword_id).first()
+    )
+    if summary is None:
+        return {}
+    volatility, previous_id, previous_flag = summary
+    if previous_id is not None and previous_id != run_id:
+        rows = db.query(SerpEntry.landing_url, SerpEntry.page, SerpEntry.rank).filter(
+            SerpEntry.crawl_run_id == previous_id
+        )
+        volatility = update_volatility(volatility, change_score(ranking(rows), current, previous_flag, flag))
+    return {"volatility": volatility, "next_crawl_at": completed_at + recrawl_interval(volatility)}
+
+
+def schedule_after_failure(db: Session, keyword_id: UUID, run_id: UUID, failed_at: datetime) -> dict:
+    # A failed run pushes next_crawl_at out by the backoff for the failures since the last
+    # success (this one included), so a keyword that keeps failing is not retried every tick.
+    since = db.query(Keyword.latest_run_started_at).filter(Keyword.id == keyword_id).scalar()
+    earlier = db.query(func.count(CrawlRun.id)).filter(
+        CrawlRun.keyword_id == keyword_id, CrawlRun.status == "failure", CrawlRun.id != run_id
+    )
+    if since is not None:
+        earlier = earlier.filter(CrawlRun.started_at > since)
+    return {"next_crawl_at": failed_at + failure_backoff(earlier.scalar() + 1)}
+
+
+def enqueue_due(db: Session, now: datetime) -> int:
+    # Due keywords (never crawled first, then most overdue) without a queued or running job,
+    # as many as the rolling 24h Naver page budget still allows.
+    budget = settings.crawler_daily_request_budget
+    remaining = budget - pages_requested_since(db, now - timedelta(days=1)) if budget > 0 else None
+    if remaining is not None and remaining <= 0:
+        return 0
+
+    busy = db.query(CrawlJob.keyword_id).filter(CrawlJob.status.in_(ACTIVE_JOB_STATUSES))
+    candidates = (
+        db.query(Keyword.id, Keyword.crawl_depth)
+        .filter(
+            Keyword.status == "active",
+            (Keyword.next_crawl_at.is_(None)) | (Keyword.next_crawl_at <= now),
+            Keyword.id.not_in(busy),
+        )
+        .order_by(Keyword.next_crawl_at.is_not(None), Keyword.next_crawl_at)
+    )
+    due: List[Tuple[UUID, Optional[datetime]]] = []
+    for keyword_id, depth in candidates:
+        cost = resolve_crawl_depth(depth)
+        if remaining is not None:
+            if cost > remaining:
+                break
+            remaining -= cost
+        due.append((keyword_id, None))
+    return sum(crawl.created for crawl in crud_job.enqueue(db, due, source="scheduler"))
+
+
+def pages_requested_since(db: Session, since: datetime) -> int:
+    # Every attempt counts, failed and reclaimed ones included; a job not started yet reserves one.
+    attempts = case((CrawlJob.attempts > 1, CrawlJob.attempts), else_=1)
+    rows = (
+        db.query(Keyword.crawl_depth, func.sum(attempts))
+        .join(CrawlJob, CrawlJob.keyword_id == Keyword.id)
+        .filter(CrawlJob.created_at >= since)
+        .group_by(Keyword.crawl_depth)
+    )
+    return sum(resolve_crawl_depth(depth) * count for depth, count in rows)
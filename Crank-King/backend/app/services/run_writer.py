@@ -0,0 +1,103 @@
+from datetime import datetime
+from typing import Any, Iterable, List, Optional, Tuple
+from uuid import UUID, uuid4
+
+from sqlalchemy.orm import Session
+
+from app.crawlers.naver import SerpEntryData
+from app.crud import bulk
+from app.crud import crawl as crud_crawl
+from app.crud.job import Lease
+from app.db.session import run_in_db
+from app.models.crawl import HttpCheck
+from app.schemas.crawl import CrawlRun as CrawlRunSchema
+from app.schemas.crawl import HttpCheck as HttpCheckSchema
+from app.schemas.crawl import SerpEntry as SerpEntrySchema
+from app.services import recrawl
+
+
+class CrawlRunWriter:
+    # Buffers one run's rows in memory and persists them with two commits: the run row on
+    # start(), everything else on complete()/fail(). Ids and timestamps are assigned here, so
+    # the response is built from the buffer instead of being reloaded from the database.
+
+    def __init__(
+        self, db: Session, keyword_id: UUID, run_id: Optional[UUID] = None, lease: Optional[Lease] = None
+    ) -> None:
+        # With ``run_id`` the writer takes over a run created ahead of time (e.g. a queued job's).
+        # With ``lease`` every write first checks the job is still leased to this worker.
+        self.db = db
+        self.lease = lease
+        self.existing = run_id is not None
+        self.run_id = run_id or uuid4()
+        self.keyword_id = keyword_id
+        self.started_at = datetime.utcnow()
+        self.entries: List[Tuple[Any, ...]] = []
+        self.checks: List[Tuple[Any, ...]] = []
+
+    async def start(self) -> None:
+        if self.existing:
+            await run_in_db(crud_crawl.start_run, self.db, self.run_id, self.started_at, self.lease)
+        else:
+            await run_in_db(crud_crawl.insert_run, self.db, self.run_id, self.keyword_id, self.started_at)
+
+    def add_entry(self, entry: SerpEntryData, is_match: bool, match_reason: Optional[str]) -> None:
+        self.entries.append(bulk.serp_entry_row(self.run_id, entry, is_match, match_reason))
+
+    def add_checks(self, checks: Iterable[HttpCheck]) -> None:
+        self.checks.extend(bulk.http_check_row(self.run_id, check) for check in checks)
+
+    async def complete(self, flag: str, https_issues: Optional[dict] = None) -> CrawlRunSchema:
+        values = {"status": "success", "completed_at": datetime.utcnow(), "flag": flag, "https_issues": https_issues}
+        await run_in_db(self._finish_success, values)
+        return self._result(values)
+
+    def _finish_success(self, values: dict) -> None:
+        # The keyword's recrawl schedule is read and written inside the completing transaction.
+        schedule = None
+        if recrawl.enabled():
+            current = recrawl.ranking((row[6], row[2], row[3]) for row in self.entries)
+            schedule = recrawl.schedule_after_run(
+                self.db, self.keyword_id, self.run_id, current, values["flag"], values["completed_at"]
+            )
+        crud_crawl.finish_run(
+            self.db,
+            self.run_id,
+            values,
+            self.entries,
+            self.checks,
+            keyword_id=self.keyword_id,
+            keyword_values=schedule,
+            started_at=self.started_at,
+            lease=self.lease,
+        )
+
+    async def fail(self, message: str) -> CrawlRunSchema:
+        # Buffered rows are dropped: a failed run only records why it failed.
+        values = {"status": "failure", "completed_at": datetime.utcnow(), "notes": message}
+        await run_in_db(self._finish_failure, values)
+        self.entries, self.checks = [], []
+        return self._result(values)
+
+    def _finish_failure(self, values: dict) -> None:
+        self.db.rollback()
+        backoff = None
+        if recrawl.enabled():
+            backoff = recrawl.schedule_after_failure(self.db, self.keyword_id, self.run_id, values["completed_at"])
+        crud_crawl.finish_run(
+            self.db, self.run_id, values, [], [], keyword_id=self.keyword_id, keyword_values=backoff, lease=self.lease
+        )
+
+    def _result(self, values: dict) -> CrawlRunSchema:
+        return CrawlRunSchema(
+            id=self.run_id,
+            keyword_id=self.keyword_id,
+            started_at=self.started_at,
+            completed_at=values["completed_at"],
+            status=values["status"],
+            flag=values.get("flag"),
+            notes=values.get("notes"),
+            https_issues=values.get("https_issues"),
+            serp_entries=[SerpEntrySchema(**dict(zip(bulk.SERP_ENTRY_COLUMNS, row))) for row in self.entries],
+            http_checks=[HttpCheckSchema(**dict(zip(bulk.HTTP_CHECK_COLUMNS, row))) for row in self.checks],
+        )
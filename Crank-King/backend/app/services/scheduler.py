@@ -1,33 +1,115 @@
-import asyncio
-from typing import Optional
+import hashlib
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+from uuid import UUID
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
 
 from app.core.config import settings
-from app.db.session import SessionLocal
+from app.crud import job as crud_job
+from app.db.session import run_in_session
+from app.models.crawl import CrawlJob
 from app.models.keyword import Keyword
-from app.services.crawler import execute_crawl
+from app.services import recrawl
+from app.services.http_clients import http_clients
+
+logger = logging.getLogger(__name__)
 
 scheduler: Optional[AsyncIOScheduler] = None
 
 
+def _enqueue_active_keywords(db: Session) -> int:
+    keyword_ids = [row.id for row in db.query(Keyword.id).filter(Keyword.status == "active").all()]
+    crawls = crud_job.enqueue(db, [(keyword_id, None) for keyword_id in keyword_ids], source="scheduler")
+    return sum(crawl.created for crawl in crawls)
+
+
 async def crawl_all_active_keywords() -> None:
-    db = SessionLocal()
-    try:
-        keywords = db.query(Keyword).filter(Keyword.status == "active").all()
-        for keyword in keywords:
-            await execute_crawl(db, keyword)
-            await asyncio.sleep(settings.crawler_delay_seconds)
-    finally:
-        db.close()
+    # Only enqueues; crawl workers (embedded or ``python -m app.worker``) do the crawling.
+    await run_in_session(_enqueue_active_keywords)
+
+
+def keyword_slot(keyword_id: UUID, shards: int = 1) -> Tuple[float, int]:
+    # Stable across processes and restarts: position in the window as a fraction, and shard index.
+    digest = hashlib.blake2b(keyword_id.bytes, digest_size=16).digest()
+    offset = int.from_bytes(digest[:8], "big") / 2**64
+    return offset, int.from_bytes(digest[8:], "big") % max(shards, 1)
+
+
+def window_bounds(now: datetime) -> Tuple[datetime, timedelta]:
+    window = timedelta(hours=min(max(settings.crawler_schedule_window_hours, 0.0), 24.0)) or timedelta(hours=24)
+    start = now.replace(hour=settings.crawler_schedule_window_start_hour % 24, minute=0, second=0, microsecond=0)
+    if start > now:
+        start -= timedelta(days=1)
+    return start, window
+
+
+def _enqueue_due_keywords(db: Session, now: datetime, shard: int, shards: int) -> int:
+    # Every active keyword of this shard whose slot in today's window has passed and that has not
+    # been crawled for it: no scheduler job since the window opened, and no job of any source
+    # (API, batch) queued or running at or after its slot, which an enqueue would have coalesced
+    # onto. State lives in crawl_jobs, so a restarted scheduler continues where the previous one
+    # stopped, catching up on slots it missed.
+    start, window = window_bounds(now)
+    elapsed = min((now - start) / window, 1.0)
+    already = set()
+    covered_until: Dict[UUID, datetime] = {}
+    jobs = db.query(CrawlJob.keyword_id, CrawlJob.source, CrawlJob.created_at, CrawlJob.finished_at).filter(
+        or_(CrawlJob.created_at >= start, CrawlJob.finished_at >= start, CrawlJob.finished_at.is_(None))
+    )
+    for keyword_id, source, created_at, finished_at in jobs:
+        if source == "scheduler" and created_at >= start:
+            already.add(keyword_id)
+        until = finished_at or now
+        if until > covered_until.get(keyword_id, start):
+            covered_until[keyword_id] = until
+    due = []
+    for (keyword_id,) in db.query(Keyword.id).filter(Keyword.status == "active"):
+        offset, keyword_shard = keyword_slot(keyword_id, shards)
+        if keyword_shard != shard or offset > elapsed or keyword_id in already:
+            continue
+        if covered_until.get(keyword_id, start) >= start + window * offset:
+            continue
+        due.append((keyword_id, None))
+    return sum(crawl.created for crawl in crud_job.enqueue(db, due, source="scheduler"))
+
+
+async def enqueue_due_keywords() -> None:
+    count = await run_in_session(
+        _enqueue_due_keywords, datetime.utcnow(), settings.crawler_schedule_shard, settings.crawler_schedule_shards
+    )
+    if count:
+        logger.info("Scheduled %d keywords (shard %d/%d)", count, settings.crawler_schedule_shard, settings.crawler_schedule_shards)
+
+
+async def enqueue_recrawls() -> None:
+    count = await run_in_session(recrawl.enqueue_due, datetime.utcnow())
+    if count:
+        logger.info("Scheduled %d keywords for recrawl", count)
 
 
 def start_scheduler() -> None:
     global scheduler
     if scheduler and scheduler.running:
         return
+    http_clients.start()
     scheduler = AsyncIOScheduler()
-    scheduler.add_job(crawl_all_active_keywords, "cron", hour=3, minute=0)
+    ticks = {"adaptive": enqueue_recrawls, "staggered": enqueue_due_keywords}
+    tick = ticks.get(settings.crawler_schedule_mode)
+    if tick is not None:
+        scheduler.add_job(
+            tick,
+            "interval",
+            seconds=settings.crawler_schedule_tick_seconds,
+            next_run_time=datetime.now(),
+            max_instances=1,
+            coalesce=True,
+        )
+    else:
+        scheduler.add_job(crawl_all_active_keywords, "cron", hour=3, minute=0)
     scheduler.start()
 
 
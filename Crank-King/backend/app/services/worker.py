@@ -0,0 +1,153 @@
+import asyncio
+import logging
+import os
+import socket
+from typing import Optional, Set
+from uuid import uuid4
+
+from app.core.config import settings
+from app.crud import job as crud_job
+from app.db.session import SessionLocal, run_in_db, run_in_session
+from app.models.keyword import Keyword
+from app.services.crawler import execute_crawl
+from app.services.http_clients import http_clients
+
+logger = logging.getLogger(__name__)
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:6]}"
+
+
+class CrawlWorker:
+    # Claims jobs from crawl_jobs and runs up to ``concurrency`` of them at once. Any number of
+    # workers, in any number of processes or hosts, can share one queue.
+
+    def __init__(
+        self,
+        worker_id: Optional[str] = None,
+        concurrency: Optional[int] = None,
+        lease_seconds: Optional[float] = None,
+        poll_seconds: Optional[float] = None,
+        shutdown_grace_seconds: Optional[float] = None,
+    ) -> None:
+        self.worker_id = worker_id or default_worker_id()
+        self.concurrency = max(concurrency or settings.crawler_concurrency, 1)
+        self.lease_seconds = lease_seconds or settings.crawler_job_lease_seconds
+        self.poll_seconds = poll_seconds or settings.crawler_job_poll_seconds
+        if shutdown_grace_seconds is None:
+            shutdown_grace_seconds = settings.crawler_shutdown_grace_seconds
+        self.shutdown_grace_seconds = shutdown_grace_seconds
+        self._tasks: Set[asyncio.Task] = set()
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._runner: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._runner is None:
+            self._runner = asyncio.get_running_loop().create_task(self.run())
+
+    async def stop(self) -> None:
+        # Stops claiming and gives jobs in progress shutdown_grace_seconds to finish.
+        self._stopping = True
+        self._wakeup.set()
+        if self._runner is not None:
+            await self._runner
+            self._runner = None
+
+    async def run(self) -> None:
+        logger.info("Crawl worker %s started (concurrency %d)", self.worker_id, self.concurrency)
+        while not self._stopping:
+            self._wakeup.clear()
+            free = self.concurrency - len(self._tasks)
+            jobs = []
+            if free > 0:
+                try:
+                    jobs = await run_in_session(
+                        crud_job.claim,
+                        self.worker_id,
+                        free,
+                        self.lease_seconds,
+                        settings.crawler_job_max_attempts,
+                    )
+                except Exception:
+                    logger.exception("Claiming crawl jobs failed")
+            for job in jobs:
+                task = asyncio.create_task(self._process(job))
+                self._tasks.add(task)
+                task.add_done_callback(self._on_done)
+            if jobs and len(jobs) == free:
+                continue
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+        if self._tasks:
+            await self._drain()
+        logger.info("Crawl worker %s stopped", self.worker_id)
+
+    async def _drain(self) -> None:
+        # Crawls can sit in Retry-After pauses, retry backoff or a breaker cooldown for minutes.
+        # Whatever is still running after the grace period is cancelled; its lease expires and
+        # another worker reclaims the job.
+        tasks = list(self._tasks)
+        _, pending = await asyncio.wait(tasks, timeout=max(self.shutdown_grace_seconds, 0))
+        if pending:
+            logger.warning("Cancelling %d crawl jobs still running at shutdown", len(pending))
+            for task in pending:
+                task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _on_done(self, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        self._wakeup.set()
+
+    async def _process(self, job: crud_job.ClaimedJob) -> None:
+        lease = crud_job.Lease(job.id, self.worker_id, job.attempts)
+        lost = asyncio.Event()
+        heartbeat = asyncio.create_task(self._heartbeat(lease, asyncio.current_task(), lost))
+        db = SessionLocal()
+        status, error = "done", None
+        try:
+            keyword = await run_in_db(db.get, Keyword, job.keyword_id)
+            if keyword is None:
+                status, error = "failed", "keyword no longer exists"
+            else:
+                await execute_crawl(
+                    db, keyword, http_clients.client, use_cache=job.use_cache, run_id=job.crawl_run_id, lease=lease
+                )
+        except asyncio.CancelledError:
+            if not lost.is_set():
+                raise
+            # The heartbeat lost the lease: another worker owns the job and its run, so record nothing.
+            logger.warning("Crawl job %s abandoned by %s: lease lost", job.id, self.worker_id)
+            return
+        except crud_job.LeaseLost:
+            logger.warning("Crawl job %s abandoned by %s: lease lost", job.id, self.worker_id)
+            return
+        except Exception as exc:
+            status, error = "failed", str(exc) or exc.__class__.__name__
+            logger.exception("Crawl job %s failed", job.id)
+        finally:
+            heartbeat.cancel()
+            await run_in_db(db.close)
+        try:
+            await run_in_session(crud_job.finish, lease, status, error)
+        except Exception:
+            # The lease runs out and another worker picks the job up again.
+            logger.exception("Recording crawl job %s as %s failed", job.id, status)
+
+    async def _heartbeat(self, lease: crud_job.Lease, crawl: asyncio.Task, lost: asyncio.Event) -> None:
+        # Renews the lease; once it is lost the crawl is cancelled rather than left to run twice.
+        # The cancellation lands between DB calls: run_in_db waits for a call already on a thread.
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                renewed = await run_in_session(crud_job.renew_lease, lease, self.lease_seconds)
+            except Exception:
+                logger.exception("Renewing lease of crawl job %s failed", lease.job_id)
+                continue
+            if not renewed:
+                lost.set()
+                crawl.cancel()
+                return
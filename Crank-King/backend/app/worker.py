@@ -0,0 +1,43 @@
+"""Standalone crawl worker.
+
+Claims jobs from the ``crawl_jobs`` table and runs them; start as many as needed, on any host
+that can reach the database::
+
+    python -m app.worker --concurrency 8
+
+Set ``CRAWLER_EMBEDDED_WORKER=false`` on the API when crawling is left to these processes.
+"""
+
+import argparse
+import asyncio
+import logging
+import signal
+from typing import List, Optional
+
+from app.services.http_clients import http_clients
+from app.services.worker import CrawlWorker
+
+
+async def serve(worker: CrawlWorker) -> None:
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, lambda: asyncio.ensure_future(worker.stop()))
+    http_clients.start()
+    try:
+        await worker.run()
+    finally:
+        await http_clients.stop()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--worker-id", default=None)
+    parser.add_argument("--concurrency", type=int, default=None, help="jobs run at once (CRAWLER_CONCURRENCY)")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s %(message)s")
+
+    asyncio.run(serve(CrawlWorker(worker_id=args.worker_id, concurrency=args.concurrency)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+# Crawler benchmarks
@@ -0,0 +1,249 @@
+"""Parser and crawl-pipeline micro benchmarks.
+
+Run from ``backend/``::
+
+    python -m benchmarks.bench_parser                  # compare against the saved baseline
+    python -m benchmarks.bench_parser --save-baseline  # record a new baseline for this machine
+"""
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from html import unescape
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from bs4 import BeautifulSoup
+
+from app.crawlers import naver
+from app.models.crawl import HttpCheck
+from app.models.keyword import Keyword
+from app.services.crawler import determine_flag, entry_matches
+
+SAMPLES_DIR = Path(__file__).resolve().parents[2] / "docs" / "samples"
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+SAMPLE_NAMES = ["bundang_page1", "bundang_page1_web", "bundang_page2", "bundang_page2_web"]
+
+
+@dataclass
+class Case:
+    stage: str
+    fixture: str
+    func: Callable[[], object]
+    size_bytes: int = 0
+
+    @property
+    def key(self) -> str:
+        return f"{self.stage}/{self.fixture}"
+
+
+@dataclass
+class Result:
+    key: str
+    seconds_per_op: float
+    ops_per_second: float
+    mb_per_second: Optional[float]
+    peak_kib: float
+    retained_blocks: int
+
+
+def load_samples(samples_dir: Path) -> Dict[str, str]:
+    return {name: (samples_dir / f"{name}.html").read_text(encoding="utf-8") for name in SAMPLE_NAMES}
+
+
+def without_payload(html: str) -> str:
+    return html.replace(naver.WEB_SERP_ANCHOR, '"data-slog-container":"benchmark"')
+
+
+def synthetic_payload_page(html: str, factor: int) -> str:
+    start = naver._locate_web_payload(html)
+    payload, end = json.JSONDecoder().raw_decode(html, start)
+    for section in payload["body"]["props"]["children"]:
+        children = section.get("props", {}).get("children", [])
+        children[:] = children * factor
+    filler = "<div class=\"filler\">" + "x" * 1024 + "</div>"
+    return html[:start] + json.dumps(payload, ensure_ascii=False, separators=(",", ":")) + html[end:] + filler * 200 * factor
+
+
+def synthetic_dom_page(results: int) -> str:
+    nodes = "".join(
+        '<div class="total_wrap"><div class="total_group">'
+        f'<a class="link_name" href="https://site{i}.example.com/p">Result <mark>{i}</mark> &amp; title</a>'
+        f'<a class="link_url">site{i}.example.com</a></div></div>'
+        '<div class="filler"><span>' + "y" * 512 + "</span></div>"
+        for i in range(results)
+    )
+    head = "<html><head>" + "<script>var x = 1;</script>" * 200 + "</head><body>"
+    return f'{head}<div id="header">{"<p>nav</p>" * 500}</div><div id="main_pack"><div class="total_group">{nodes}</div></div></body></html>'
+
+
+def payload_titles(pages: List[str]) -> List[str]:
+    titles: List[str] = []
+    for html in pages:
+        payload = naver._extract_web_payload(html)
+        if payload is None:
+            continue
+        for section in payload["body"]["props"]["children"]:
+            for child in section.get("props", {}).get("children", []):
+                title = child.get("props", {}).get("title")
+                if isinstance(title, dict):
+                    title = title.get("text", "")
+                if isinstance(title, str):
+                    titles.append(title)
+    return titles
+
+
+def check_strip_html(titles: List[str]) -> List[str]:
+    # Differential check of the fast title stripper against the original BeautifulSoup routine.
+    mismatches = []
+    for title in titles:
+        expected = BeautifulSoup(unescape(title), "html.parser").get_text(separator=" ", strip=True)
+        if naver._strip_html(title) != expected:
+            mismatches.append(title)
+    return mismatches
+
+
+def build_cases(samples: Dict[str, str], synthetic_factor: int) -> List[Case]:
+    cases: List[Case] = []
+    payload_pages = {name: html for name, html in samples.items() if naver._extract_web_payload(html) is not None}
+    large_payload = synthetic_payload_page(samples["bundang_page1_web"], synthetic_factor)
+    payload_pages[f"synthetic_x{synthetic_factor}"] = large_payload
+
+    dom_pages = {name: without_payload(html) for name, html in samples.items()}
+    dom_pages[f"synthetic_{20 * synthetic_factor}_results"] = synthetic_dom_page(20 * synthetic_factor)
+
+    for name, html in payload_pages.items():
+        size = len(html.encode("utf-8"))
+        cases.append(Case("parse_serp_payload", name, lambda html=html: naver.parse_serp(html, "q", 1), size))
+        start = naver._locate_web_payload(html)
+        cases.append(
+            Case("consume_balanced_json", name, lambda html=html, start=start: naver._consume_balanced_json(html, start), size)
+        )
+
+    for name, html in dom_pages.items():
+        size = len(html.encode("utf-8"))
+        cases.append(Case("parse_serp_dom", name, lambda html=html: naver.parse_serp(html, "q", 1), size))
+
+    titles = payload_titles(list(payload_pages.values()))
+    cases.append(Case("strip_html", "sample_titles", lambda: [naver._strip_html(t) for t in titles]))
+    cases.append(
+        Case("strip_html_uncached", "sample_titles", lambda: [naver._strip_markup.__wrapped__(t) for t in titles])
+    )
+
+    entries = [entry for html in payload_pages.values() for entry in naver.parse_serp(html, "q", 1).entries]
+    keyword = Keyword(
+        query="분당 보컬학원",
+        target_names=[f"보컬스튜디오 {i}" for i in range(50)] + ["어썸 보컬학원"],
+        target_domains=[f"vocal{i}.example.com" for i in range(50)] + ["asomemusic.com"],
+    )
+    cases.append(Case("entry_matches", "sample_entries", lambda: [entry_matches(e, keyword) for e in entries]))
+
+    matched = [entry.landing_url for entry in entries]
+    checks = [HttpCheck(url=url, protocol="https", ssl_valid=True, status_code=200) for url in matched]
+    cases.append(Case("determine_flag", "sample_entries", lambda: determine_flag(matched, checks)))
+    return cases
+
+
+def measure(case: Case, min_time: float, repeat: int) -> Result:
+    case.func()
+    loops = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(loops):
+            case.func()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time:
+            break
+        loops *= 2
+
+    best = elapsed / loops
+    for _ in range(repeat - 1):
+        started = time.perf_counter()
+        for _ in range(loops):
+            case.func()
+        best = min(best, (time.perf_counter() - started) / loops)
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    output = case.func()
+    _, peak = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    retained_blocks = sum(max(stat.count_diff, 0) for stat in after.compare_to(before, "lineno"))
+    del output
+
+    mb_per_second = case.size_bytes / best / 1_000_000 if case.size_bytes else None
+    return Result(
+        key=case.key,
+        seconds_per_op=best,
+        ops_per_second=1 / best,
+        mb_per_second=mb_per_second,
+        peak_kib=peak / 1024,
+        retained_blocks=retained_blocks,
+    )
+
+
+def compare(results: List[Result], baseline: Dict[str, float], threshold: float) -> List[str]:
+    regressions = []
+    for result in results:
+        reference = baseline.get(result.key)
+        if reference and result.seconds_per_op > reference * (1 + threshold):
+            ratio = result.seconds_per_op / reference
+            regressions.append(f"{result.key}: {ratio:.2f}x slower than baseline")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--samples-dir", type=Path, default=SAMPLES_DIR)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown ratio before failing")
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per timing round")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--synthetic-factor", type=int, default=10)
+    parser.add_argument("--filter", default="", help="only run cases whose key contains this text")
+    args = parser.parse_args(argv)
+
+    samples = load_samples(args.samples_dir)
+    mismatches = check_strip_html(payload_titles(list(samples.values())))
+    if mismatches:
+        print(f"_strip_html differs from the BeautifulSoup reference on {len(mismatches)} titles:")
+        for title in mismatches:
+            print(f"  {title!r}")
+        return 1
+
+    cases = [case for case in build_cases(samples, args.synthetic_factor) if args.filter in case.key]
+    results: List[Result] = []
+    print(f"{'case':<50} {'ops/s':>10} {'MB/s':>8} {'peak KiB':>10} {'blocks':>8}")
+    for case in cases:
+        result = measure(case, args.min_time, args.repeat)
+        results.append(result)
+        mbps = f"{result.mb_per_second:.1f}" if result.mb_per_second is not None else "-"
+        print(f"{result.key:<50} {result.ops_per_second:>10.1f} {mbps:>8} {result.peak_kib:>10.1f} {result.retained_blocks:>8}")
+
+    if args.save_baseline:
+        baseline = {result.key: result.seconds_per_op for result in results}
+        args.baseline.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}; run with --save-baseline to record one.")
+        return 0
+
+    regressions = compare(results, json.loads(args.baseline.read_text(encoding="utf-8")), args.threshold)
+    if regressions:
+        print("Regressions:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    print(f"No regressions beyond {args.threshold:.0%} of baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+"""End-to-end crawl throughput against the local Naver stand-in.
+
+Start the stand-in, then run from ``backend/``::
+
+    python -m app.crawlers.standin --port 8900 --latency-ms 80 --jitter-ms 40
+    python -m benchmarks.crawl_load --keywords 2000 --concurrency 64 --naver-rate 0
+
+Only the fetch + parse path (``crawl_keyword``) is exercised; nothing is written to the database.
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from typing import List, Optional
+
+from app.core.config import settings
+from app.crawlers import naver
+from app.services.http_clients import build_http_client
+from app.services.rate_limiter import naver_controller
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+async def run(keywords: int, concurrency: int) -> int:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    pages = 0
+    entries = 0
+    errors = 0
+
+    async def crawl_one(client, index: int) -> None:
+        nonlocal pages, entries, errors
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                result = await naver.crawl_keyword(f"load test keyword {index}", client, use_cache=False)
+            except Exception:
+                errors += 1
+                return
+            latencies.append(time.perf_counter() - started)
+            pages += len(result)
+            entries += sum(len(page.entries) for page in result)
+
+    started = time.perf_counter()
+    async with build_http_client() as client:
+        await asyncio.gather(*(crawl_one(client, index) for index in range(keywords)))
+    elapsed = time.perf_counter() - started
+
+    print(f"target          {naver.search_base_url()}")
+    print(f"keywords        {keywords} ({errors} failed) in {elapsed:.2f}s")
+    print(f"throughput      {keywords / elapsed:.1f} keywords/s, {pages / elapsed:.1f} pages/s")
+    print(f"entries parsed  {entries}")
+    print(f"latency/keyword p50 {percentile(latencies, 0.5) * 1000:.0f} ms, p95 {percentile(latencies, 0.95) * 1000:.0f} ms")
+    return 1 if errors else 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:8900/search.naver", help="stand-in search URL")
+    parser.add_argument("--keywords", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=settings.crawler_concurrency)
+    parser.add_argument("--naver-rate", type=float, default=0.0, help="global request rate, 0 disables limiting")
+    args = parser.parse_args(argv)
+
+    settings.crawler_replay_url = args.url
+    naver_controller.bucket.rate = naver_controller.max_rate = args.naver_rate
+    naver_controller.max_concurrency = args.concurrency
+    naver_controller.slots.limit = args.concurrency
+    return asyncio.run(run(args.keywords, args.concurrency))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,61 @@
+from typing import List
+from uuid import UUID
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session, sessionmaker
+
+import app.models  # noqa: F401
+from app.db.base_class import BaseModel
+from app.models.keyword import Keyword
+from app.models.user import User
+
+
+@compiles(JSONB, "sqlite")
+def _jsonb_on_sqlite(type_, compiler, **kw):
+    return "JSON"
+
+
+@pytest.fixture
+def engine(tmp_path):
+    # A file database, so several sessions can use it at once like they would PostgreSQL.
+    engine = create_engine(f"sqlite:///{tmp_path / 'crank_king.db'}")
+
+    @event.listens_for(engine, "connect")
+    def _connect(dbapi_connection, connection_record):
+        # Let SQLAlchemy issue BEGIN itself, so savepoints behave, and enforce foreign keys.
+        dbapi_connection.isolation_level = None
+        dbapi_connection.execute("PRAGMA foreign_keys=ON")
+
+    @event.listens_for(engine, "begin")
+    def _begin(connection):
+        connection.exec_driver_sql("BEGIN")
+
+    BaseModel.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session_factory(engine):
+    return sessionmaker(bind=engine, autocommit=False, autoflush=False)
+
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def keyword_ids(db: Session) -> List[UUID]:
+    user = User(email="owner@example.com", hashed_password="x")
+    db.add(user)
+    db.flush()
+    keywords = [Keyword(owner_id=user.id, query=f"keyword {index}", target_names=["분당"]) for index in range(3)]
+    db.add_all(keywords)
+    db.commit()
+    return [keyword.id for keyword in keywords]
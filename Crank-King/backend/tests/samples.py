@@ -0,0 +1,31 @@
+from pathlib import Path
+from typing import Dict, List
+
+from app.crawlers import naver
+
+SAMPLES_DIR = Path(__file__).resolve().parents[2] / "docs" / "samples"
+SAMPLE_NAMES = ["bundang_page1", "bundang_page1_web", "bundang_page2", "bundang_page2_web"]
+
+
+def load_samples() -> Dict[str, str]:
+    # The saved SERP pages under docs/samples, or nothing when the checkout does not have them.
+    paths = [SAMPLES_DIR / f"{name}.html" for name in SAMPLE_NAMES]
+    if not all(path.exists() for path in paths):
+        return {}
+    return {path.stem: path.read_text(encoding="utf-8") for path in paths}
+
+
+def payload_titles(pages: List[str]) -> List[str]:
+    titles: List[str] = []
+    for html in pages:
+        payload = naver._extract_web_payload(html)
+        if payload is None:
+            continue
+        for section in payload["body"]["props"]["children"]:
+            for child in section.get("props", {}).get("children", []):
+                title = child.get("props", {}).get("title")
+                if isinstance(title, dict):
+                    title = title.get("text", "")
+                if isinstance(title, str):
+                    titles.append(title)
+    return titles
@@ -0,0 +1,120 @@
+from datetime import datetime
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+
+from app.crud import job as crud_job
+from app.models.crawl import ACTIVE_JOB_INDEX, CrawlJob, CrawlRun
+
+
+def job_count(db):
+    return db.query(CrawlJob).count()
+
+
+def test_enqueue_attaches_to_the_active_job(db, keyword_ids):
+    (first,) = crud_job.enqueue(db, [(keyword_ids[0], None)], "api")
+    (again,) = crud_job.enqueue(db, [(keyword_ids[0], None)], "batch")
+
+    assert first.created and not again.created
+    assert (again.job_id, again.crawl_run_id) == (first.job_id, first.crawl_run_id)
+    assert job_count(db) == 1
+
+
+def test_enqueue_reuses_a_fresh_success(db, keyword_ids):
+    run_id = uuid4()
+    now = datetime.utcnow()
+    db.add(CrawlRun(id=run_id, keyword_id=keyword_ids[0], started_at=now, completed_at=now, status="success"))
+    db.commit()
+
+    (reused,) = crud_job.enqueue(db, [(keyword_ids[0], None)], "api", fresh_seconds=300)
+    assert (reused.crawl_run_id, reused.job_id, reused.created) == (run_id, None, False)
+    (fresh,) = crud_job.enqueue(db, [(keyword_ids[0], None)], "api")
+    assert fresh.created and fresh.crawl_run_id != run_id
+
+
+def test_enqueue_race_falls_back_row_by_row(db, keyword_ids, monkeypatch):
+    # Another enqueuer commits a job for the first keyword after this one looked for active jobs:
+    # the bulk insert hits the active-job index, and that keyword is attached to the winner.
+    (winner,) = crud_job.enqueue(db, [(keyword_ids[0], None)], "api")
+    existing_crawls = crud_job._existing_crawls
+    calls = []
+
+    def not_yet_visible(db, keyword_ids, now, fresh_seconds):
+        calls.append(keyword_ids)
+        return {} if len(calls) == 1 else existing_crawls(db, keyword_ids, now, fresh_seconds)
+
+    monkeypatch.setattr(crud_job, "_existing_crawls", not_yet_visible)
+    crawls = crud_job.enqueue(db, [(keyword_id, None) for keyword_id in keyword_ids], "scheduler")
+
+    assert [crawl.keyword_id for crawl in crawls] == keyword_ids
+    assert crawls[0].job_id == winner.job_id and not crawls[0].created
+    assert all(crawl.created for crawl in crawls[1:])
+    assert calls[1] == [keyword_ids[0]]
+    assert job_count(db) == 3
+    assert db.query(CrawlRun).count() == 3
+
+
+def test_enqueue_leaves_out_a_deleted_keyword(db, keyword_ids):
+    ghost = uuid4()
+    crawls = crud_job.enqueue(db, [(ghost, None), (keyword_ids[0], None)], "batch")
+
+    assert [crawl.keyword_id for crawl in crawls] == [keyword_ids[0]]
+    assert job_count(db) == 1
+    assert crud_job.enqueue(db, [(ghost, None)], "api") == []
+
+
+def test_enqueue_without_commit_leaves_the_transaction_to_the_caller(db, session_factory, keyword_ids):
+    crud_job.enqueue(db, [(keyword_ids[0], None)], "batch", commit=False)
+    db.rollback()
+    assert job_count(db) == 0
+
+    crud_job.enqueue(db, [(keyword_ids[0], None)], "batch", commit=False)
+    db.commit()
+    with session_factory() as other:
+        assert job_count(other) == 1
+
+
+def integrity_error(db, job):
+    try:
+        with db.begin_nested():
+            db.execute(insert(CrawlJob).values(**job))
+    except IntegrityError as exc:
+        return exc
+    raise AssertionError("insert succeeded")
+
+
+def job_row(keyword_id, run_id):
+    return {
+        "id": uuid4(),
+        "keyword_id": keyword_id,
+        "crawl_run_id": run_id,
+        "status": "queued",
+        "source": "api",
+        "use_cache": True,
+        "run_after": datetime.utcnow(),
+        "attempts": 0,
+        "created_at": datetime.utcnow(),
+    }
+
+
+def test_is_active_job_conflict_on_sqlite(db, keyword_ids):
+    (crawl,) = crud_job.enqueue(db, [(keyword_ids[0], None)], "api")
+    duplicate = integrity_error(db, job_row(keyword_ids[0], crawl.crawl_run_id))
+    foreign_key = integrity_error(db, job_row(uuid4(), crawl.crawl_run_id))
+
+    assert crud_job.is_active_job_conflict(duplicate)
+    assert not crud_job.is_active_job_conflict(foreign_key)
+
+
+@pytest.mark.parametrize(
+    "constraint, expected",
+    [(ACTIVE_JOB_INDEX, True), ("crawl_jobs_keyword_id_fkey", False), (None, False)],
+)
+def test_is_active_job_conflict_reads_the_postgres_constraint_name(constraint, expected):
+    # psycopg2 errors carry the violated constraint in ``diag``; the message is not consulted.
+    orig = Exception("duplicate key value violates unique constraint")
+    orig.diag = SimpleNamespace(constraint_name=constraint)
+    assert crud_job.is_active_job_conflict(IntegrityError("INSERT", {}, orig)) is expected
@@ -0,0 +1,137 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event, select, update
+
+from app.crawlers.naver import SerpEntryData
+from app.crud import bulk
+from app.crud import crawl as crud_crawl
+from app.crud import job as crud_job
+from app.models.crawl import CrawlJob, CrawlRun, SerpEntry
+
+LEASE_SECONDS = 60.0
+MAX_ATTEMPTS = 3
+
+
+def claim(db, worker_id, limit=10):
+    return crud_job.claim(db, worker_id, limit, LEASE_SECONDS, MAX_ATTEMPTS)
+
+
+def expire_leases(db):
+    db.execute(update(CrawlJob).values(lease_expires_at=datetime.utcnow() - timedelta(seconds=1)))
+    db.commit()
+
+
+def lease_of(claimed, worker_id):
+    return crud_job.Lease(claimed.id, worker_id, claimed.attempts)
+
+
+def test_claim_hands_each_job_to_one_worker(db, session_factory, keyword_ids):
+    crud_job.enqueue(db, [(keyword_id, None) for keyword_id in keyword_ids], "api")
+    first = claim(db, "w1", limit=2)
+    with session_factory() as other:
+        second = claim(other, "w2")
+        third = claim(other, "w3")
+
+    assert len(first) == 2 and len(second) == 1 and third == []
+    assert {job.id for job in first}.isdisjoint(job.id for job in second)
+    jobs = db.scalars(select(CrawlJob)).all()
+    assert {job.status for job in jobs} == {"running"}
+    assert {job.attempts for job in jobs} == {1}
+
+
+def test_claim_skips_jobs_that_are_not_due(db, keyword_ids):
+    crud_job.enqueue(db, [(keyword_ids[0], datetime.utcnow() + timedelta(hours=1))], "scheduler")
+    assert claim(db, "w1") == []
+
+
+def test_claim_compare_and_set_loses_to_a_concurrent_claim(db, keyword_ids):
+    # Another worker claims the job between this worker's read and its update, as can happen
+    # without SKIP LOCKED; the update must then match no row.
+    crud_job.enqueue(db, [(keyword_ids[0], None)], "api")
+    candidates = []
+
+    @event.listens_for(db, "do_orm_execute")
+    def _claimed_meanwhile(state):
+        if state.is_select and state.statement.column_descriptions[0]["entity"] is CrawlJob:
+            frozen = state.invoke_statement().freeze()
+            candidates.extend(frozen().scalars())
+            state.session.connection().execute(
+                update(CrawlJob).values(status="running", worker_id="w2", attempts=CrawlJob.attempts + 1)
+            )
+            return frozen()
+
+    assert claim(db, "w1") == []
+    event.remove(db, "do_orm_execute", _claimed_meanwhile)
+    assert len(candidates) == 1
+    job = db.scalars(select(CrawlJob)).one()
+    db.refresh(job)
+    assert (job.worker_id, job.attempts) == ("w2", 1)
+
+
+def test_expired_lease_is_reclaimed_and_the_old_lease_fenced(db, keyword_ids):
+    crud_job.enqueue(db, [(keyword_ids[0], None)], "api")
+    (first,) = claim(db, "w1")
+    assert claim(db, "w2") == []
+    expire_leases(db)
+    (second,) = claim(db, "w2")
+
+    assert second.id == first.id and second.attempts == 2
+    stale, current = lease_of(first, "w1"), lease_of(second, "w2")
+    assert crud_job.renew_lease(db, stale, LEASE_SECONDS) is False
+    assert crud_job.renew_lease(db, current, LEASE_SECONDS) is True
+    with pytest.raises(crud_job.LeaseLost):
+        crud_job.hold_lease(db, stale)
+    crud_job.hold_lease(db, current)
+    db.rollback()
+
+
+def test_attempts_fence_a_worker_that_reclaims_its_own_job(db, keyword_ids):
+    crud_job.enqueue(db, [(keyword_ids[0], None)], "api")
+    (first,) = claim(db, "w1")
+    expire_leases(db)
+    (second,) = claim(db, "w1")
+
+    with pytest.raises(crud_job.LeaseLost):
+        crud_job.hold_lease(db, lease_of(first, "w1"))
+    crud_job.finish(db, lease_of(first, "w1"), "done")
+    assert db.get(CrawlJob, first.id).status == "running"
+    crud_job.finish(db, lease_of(second, "w1"), "done")
+    db.expire_all()
+    assert db.get(CrawlJob, first.id).status == "done"
+
+
+def test_stale_lease_cannot_write_the_run(db, keyword_ids):
+    crud_job.enqueue(db, [(keyword_ids[0], None)], "api")
+    (first,) = claim(db, "w1")
+    expire_leases(db)
+    (second,) = claim(db, "w2")
+    stale = lease_of(first, "w1")
+    now = datetime.utcnow()
+    entry = bulk.serp_entry_row(
+        first.crawl_run_id, SerpEntryData(1, 1, "title", "example.com", "https://example.com/"), False, None
+    )
+
+    with pytest.raises(crud_job.LeaseLost):
+        crud_crawl.start_run(db, first.crawl_run_id, now, stale)
+    with pytest.raises(crud_job.LeaseLost):
+        crud_crawl.finish_run(db, first.crawl_run_id, {"status": "success", "completed_at": now}, [entry], [], lease=stale)
+    assert db.get(CrawlRun, first.crawl_run_id).status == "pending"
+    assert db.query(SerpEntry).count() == 0
+
+    crud_crawl.start_run(db, second.crawl_run_id, now, lease_of(second, "w2"))
+    db.expire_all()
+    assert db.get(CrawlRun, second.crawl_run_id).status == "running"
+
+
+def test_job_failing_its_last_attempt_fails_the_run(db, keyword_ids):
+    crud_job.enqueue(db, [(keyword_ids[0], None)], "api")
+    for attempt in range(MAX_ATTEMPTS):
+        expire_leases(db)
+        (claimed,) = claim(db, f"w{attempt}")
+    expire_leases(db)
+
+    assert claim(db, "w9") == []
+    job = db.get(CrawlJob, claimed.id)
+    assert job.status == "failed" and job.attempts == MAX_ATTEMPTS
+    assert db.get(CrawlRun, claimed.crawl_run_id).status == "failure"
@@ -0,0 +1,89 @@
+import random
+from types import SimpleNamespace
+from typing import Optional, Sequence, Tuple
+from urllib.parse import urlparse
+
+import pytest
+
+from app.crawlers.naver import SerpEntryData
+from app.services.crawler import entry_matches
+from app.services.matcher import AUTOMATON_MIN_PATTERNS, PatternSet, normalize_text
+
+# A small alphabet makes overlaps, shared prefixes and repeated patterns common.
+ALPHABET = "abAB c.-가나 "
+PAIRS = 20_000
+
+
+def reference_first_match(patterns: Sequence[str], texts: Sequence[str]) -> Optional[int]:
+    # The loop PatternSet replaced: the first pattern, in list order, found in any text.
+    for index, pattern in enumerate(patterns):
+        if any(pattern in text for text in texts):
+            return index
+    return None
+
+
+def reference_entry_matches(entry: SerpEntryData, keyword) -> Tuple[bool, Optional[str]]:
+    # entry_matches before the compiled matcher; its results are the contract.
+    normalized_title = normalize_text(entry.title)
+    for candidate in [keyword.query, *(keyword.target_names or [])]:
+        cand = normalize_text(candidate)
+        if cand and cand in normalized_title:
+            return True, f"matched name '{candidate}'"
+    display = urlparse(entry.display_url if "://" in entry.display_url else f"http://{entry.display_url}")
+    display_host = display.netloc.lower()
+    landing_host = urlparse(entry.landing_url).netloc.lower()
+    for candidate in keyword.target_domains or []:
+        if candidate and (candidate.lower() in display_host or candidate.lower() in landing_host):
+            return True, f"matched domain '{candidate}'"
+    return False, None
+
+
+def random_text(rng: random.Random, longest: int) -> str:
+    return "".join(rng.choice(ALPHABET) for _ in range(rng.randint(0, longest)))
+
+
+@pytest.mark.parametrize(
+    "patterns, texts, expected",
+    [
+        (["he", "she", "his", "hers"], ["ushers"], 0),
+        (["hers", "she", "he"], ["ushers"], 0),
+        (["x", "abcd", "bc"], ["abc"], 2),
+        (["abcd", "bcd", "cd", "d", "e", "f", "g", "h"], ["xxcd"], 2),
+        (["zz", "y", "aaa", "aa", "a", "b", "c", "d"], ["", "baa"], 3),
+        (["", "a", "b", "c", "d", "e", "f", "g"], ["q"], 0),
+        (["a", "b", "c", "d", "e", "f", "g", "h"], [], None),
+    ],
+)
+def test_first_match_cases(patterns, texts, expected):
+    assert PatternSet(patterns).first_match(*texts) == expected == reference_first_match(patterns, texts)
+
+
+def test_first_match_matches_the_loop_on_random_sets():
+    rng = random.Random(20_241)
+    for _ in range(PAIRS // 4):
+        count = rng.choice([1, 3, AUTOMATON_MIN_PATTERNS - 1, AUTOMATON_MIN_PATTERNS, 12, 40])
+        patterns = [random_text(rng, 4) for _ in range(count)]
+        matcher = PatternSet(patterns)
+        for _ in range(4):
+            texts = [random_text(rng, 20) for _ in range(rng.randint(1, 2))]
+            assert matcher.first_match(*texts) == reference_first_match(patterns, texts), (patterns, texts)
+
+
+def test_entry_matches_matches_the_previous_implementation():
+    rng = random.Random(7)
+    for _ in range(2_000):
+        keyword = SimpleNamespace(
+            query=random_text(rng, 5),
+            target_names=[random_text(rng, 4) for _ in range(rng.choice([0, 2, 9, 30]))],
+            target_domains=[random_text(rng, 3) for _ in range(rng.choice([0, 2, 9, 30]))],
+        )
+        for _ in range(5):
+            display = random_text(rng, 8)
+            entry = SerpEntryData(
+                page=1,
+                rank=1,
+                title=random_text(rng, 20),
+                display_url=rng.choice([display, f"http://{display}"]),
+                landing_url=f"https://{random_text(rng, 10)}/path",
+            )
+            assert entry_matches(entry, keyword) == reference_entry_matches(entry, keyword)
@@ -0,0 +1,69 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from app.crawlers import naver
+
+OBJECTS = [
+    '{"a": 1}',
+    '{"a": {"b": [1, {"c": 2}]}}',
+    '{"brace": "}", "open": "{{"}',
+    '{"quote": "say \\"}\\" twice"}',
+    '{"slash": "ends in \\\\", "next": "}"}',
+    '{"unicode": "\\u007d 분당 }"}',
+    '{"nested": {"deeper": {"deepest": "}}}"}}}',
+]
+
+
+def feed_split(text: str, cuts: list) -> int:
+    scanner = naver._JsonObjectScanner()
+    bounds = [0, *cuts, len(text)]
+    for first, last in zip(bounds, bounds[1:]):
+        length = scanner.feed(text[first:last])
+        if length is not None:
+            return length
+    return None
+
+
+@pytest.mark.parametrize("obj", OBJECTS)
+def test_scanner_finds_the_closing_brace_at_every_split(obj):
+    text = obj + ' trailing } "text'
+    expected = len(obj)
+    assert naver._consume_balanced_json(text, 0) == obj
+    for cut in range(1, len(text)):
+        assert feed_split(text, [cut]) == expected
+    assert feed_split(text, list(range(1, len(text)))) == expected
+
+
+def test_scanner_reports_an_unclosed_object():
+    assert naver._consume_balanced_json('{"a": "}', 0) is None
+    assert feed_split('{"a": {"b": 1}', [3, 9]) is None
+
+
+def stream_response(body: bytes, chunk_size: int) -> httpx.Response:
+    class ChunkedStream(httpx.AsyncByteStream):
+        async def __aiter__(self):
+            for offset in range(0, len(body), chunk_size):
+                yield body[offset : offset + chunk_size]
+
+    return httpx.Response(200, stream=ChunkedStream(), headers={"content-type": "text/html; charset=utf-8"})
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 4096])
+def test_read_until_payload_stops_after_the_payload(chunk_size):
+    payload = {"data-slog-container": "web_lis", "body": {"title": "<b>분당</b> }{"}}
+    head = "<html><script>entry.bootstrap(document.getElementById('x'), "
+    encoded = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+    page = head + encoded + ");</script><p>rest of the page</p></html>"
+    html = asyncio.run(naver._read_until_payload(stream_response(page.encode(), chunk_size)))
+    assert html == head + encoded
+    assert naver._extract_web_payload(html) == payload
+
+
+@pytest.mark.parametrize("chunk_size", [5, 4096])
+def test_read_until_payload_buffers_pages_without_a_payload(chunk_size):
+    page = "<html><div id=\"main_pack\">분당 {</div></html>"
+    html = asyncio.run(naver._read_until_payload(stream_response(page.encode(), chunk_size)))
+    assert html == page
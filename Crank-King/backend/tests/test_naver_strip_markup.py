@@ -0,0 +1,59 @@
+from html import unescape
+
+import pytest
+from bs4 import BeautifulSoup
+
+from app.crawlers import naver
+from tests.samples import load_samples, payload_titles
+
+EDGE_CASES = [
+    "",
+    "   ",
+    "plain title",
+    "<b>분당</b> 보컬학원",
+    "<B>Upper</B>case <Mark>tags</Mark>",
+    "line<br/>break<br>again",
+    "<span><b>nested</b> tags</span> here",
+    "Tom &amp; Jerry",
+    "&lt;b&gt;escaped&lt;/b&gt; markup",
+    "double &amp;lt;b&amp;gt; escaped",
+    "&nbsp;spaced&nbsp;out&#160;",
+    "fish &amp;chips; &copy 2024",
+    '<a title="x > y">quoted gt</a> after',
+    "<a title='1 > 0' href=\"/p?a=1&b=2\">single quoted</a>",
+    "<script>var a = '<b>';</script>visible",
+    "<style>p > b { color: red }</style>styled",
+    "a < b and c > d",
+    "1 <2 but 3> 2",
+    "<b>unterminated",
+    "text <span class='x'",
+    "trailing <",
+    "<!-- comment -->after comment",
+    "<p>para</p><p>graphs</p>",
+]
+
+
+def soup_reference(title: str) -> str:
+    # The routine _strip_markup replaced; its output is the contract.
+    return BeautifulSoup(unescape(title), "html.parser").get_text(separator=" ", strip=True)
+
+
+def sample_titles():
+    return payload_titles(list(load_samples().values()))
+
+
+@pytest.mark.parametrize("title", EDGE_CASES)
+def test_strip_markup_matches_soup_on_edge_cases(title):
+    assert naver._strip_markup.__wrapped__(title) == soup_reference(title)
+
+
+def test_strip_markup_matches_soup_on_sample_titles():
+    titles = sample_titles()
+    if not titles:
+        pytest.skip("docs/samples fixtures not available")
+    mismatches = [title for title in titles if naver._strip_markup.__wrapped__(title) != soup_reference(title)]
+    assert mismatches == []
+
+
+def test_strip_html_uses_the_same_stripper():
+    assert naver._strip_html({"text": "<b>분당</b> &amp; 보컬"}) == soup_reference("<b>분당</b> &amp; 보컬")
@@ -6,7 +6,7 @@ import { useMutation, useQuery, useQueryClient } from "@tanstack/react-query";
 
 import { AuthGuard } from "@/src/components/auth-guard";
 import { useAuthStore } from "@/src/hooks/useAuth";
-import { apiClient } from "@/src/lib/api";
+import { apiClient, crawlKeywordAndWait } from "@/src/lib/api";
 
 interface KeywordSummary {
   id: string;
@@ -23,8 +23,7 @@ async function fetchKeywords() {
 }
 
 async function crawlKeyword(id: string) {
-  const response = await apiClient.post(`/keywords/${id}/crawl`);
-  return response.data;
+  return crawlKeywordAndWait(id);
 }
 
 export default function DashboardPage() {
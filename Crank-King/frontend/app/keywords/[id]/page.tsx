@@ -5,7 +5,7 @@ import { notFound, useParams } from "next/navigation";
 import { useMutation, useQuery, useQueryClient } from "@tanstack/react-query";
 
 import { AuthGuard } from "@/src/components/auth-guard";
-import { apiClient } from "@/src/lib/api";
+import { apiClient, crawlKeywordAndWait } from "@/src/lib/api";
 
 interface CrawlRun {
   id: string;
@@ -55,8 +55,7 @@ async function fetchKeywordDetail(id: string) {
 }
 
 async function triggerCrawl(id: string) {
-  const response = await apiClient.post(`/keywords/${id}/crawl`);
-  return response.data;
+  return crawlKeywordAndWait<CrawlRun>(id);
 }
 
 export default function KeywordDetailPage() {
@@ -28,3 +28,21 @@ apiClient.interceptors.response.use(
     return Promise.reject(error);
   }
 );
+
+const CRAWL_WAIT_SECONDS = 30;
+const CRAWL_MAX_WAIT_MS = 10 * 60 * 1000;
+
+// Crawls are queued: the trigger answers 202 with a pending run, then the run is long-polled until it
+// finishes, for at most CRAWL_MAX_WAIT_MS.
+export async function crawlKeywordAndWait<T extends { id: string; status: string }>(keywordId: string): Promise<T> {
+  const deadline = Date.now() + CRAWL_MAX_WAIT_MS;
+  let { data: run } = await apiClient.post<T>(`/keywords/${keywordId}/crawl`);
+  while (run.status === "pending" || run.status === "running") {
+    if (Date.now() >= deadline) {
+      throw new Error(`크롤이 ${CRAWL_MAX_WAIT_MS / 60000}분 안에 끝나지 않았습니다 (run ${run.id}, ${run.status})`);
+    }
+    const response = await apiClient.get<T>(`/crawl-runs/${run.id}/wait`, { params: { timeout: CRAWL_WAIT_SECONDS } });
+    run = response.data;
+  }
+  return run;
+}